@@ -48,6 +48,14 @@ Alternatively, from environment variables provided by QtPy, Qt.Py
     # Qt.Py
     stylesheet = qrainbowstyle.load_stylesheet(style='oceanic', qt_api=Qt.__binding__)
 
+Styles can also be created at runtime from any palette class or dictionary
+of palette variables, without generating files
+
+.. code-block:: python
+
+    stylesheet = qrainbowstyle.load_stylesheet(palette={**qrainbowstyle.palette.Oceanic.to_dict(),
+                                                        'COLOR_ACCENT_3': '#b03a2e'})
+
 Finally, set your QApplication with it
 
 .. code-block:: python
@@ -61,6 +69,9 @@ To load frameless window in your app import both qrainbowstyle and qrainbowstyle
     import qrainbowstyle
     import qrainbowstyle.windows
 
+Submodules are imported on first use, importing qrainbowstyle alone does not
+import Qt, so qrainbowstyle.windows is also available after plain import.
+
 Initialize qt app and load choosen stylesheet.
 Next, create instances of frameless window and your master widget with content you want to show.
 
@@ -94,11 +105,11 @@ Enjoy!
 
 # Standard library imports
 import os
-import sys
-import inspect
 import logging
-import platform
+import importlib
+import threading
 import qrainbowstyle
+from collections import OrderedDict
 
 __version__ = "0.9.7"
 
@@ -115,6 +126,7 @@ QSS_PATH = os.path.join(PACKAGE_PATH, 'qss')
 RC_PATH = os.path.join(PACKAGE_PATH, 'rc')
 SVG_PATH = os.path.join(PACKAGE_PATH, 'svg')
 STYLES_PATH = os.path.join(PACKAGE_PATH, 'styles')
+SHARED_RC_PATH = os.path.join(PACKAGE_PATH, 'rc_shared')
 
 BUTTONS_DARWIN_PATH = os.path.join(SVG_PATH, 'buttons_darwin')
 BUTTONS_NT_PATH = os.path.join(SVG_PATH, 'buttons_nt')
@@ -122,10 +134,15 @@ BUTTONS_NT_PATH = os.path.join(SVG_PATH, 'buttons_nt')
 # File names
 QSS_FILE = 'style.qss'
 QRC_FILE = QSS_FILE.replace('.qss', '.qrc')
+RCC_FILE = QSS_FILE.replace('.qss', '.rcc')
+RC_MANIFEST_FILE = 'rc_manifest.json'
+SHARED_QRC_FILE = 'shared.qrc'
+SHARED_RCC_FILE = 'shared.rcc'
 
 MAIN_SCSS_FILE = 'main.scss'
 STYLES_SCSS_FILE = '_styles.scss'
 VARIABLES_SCSS_FILE = '_variables.scss'
+QSS_TEMPLATE_FILE = 'style_template.json'
 
 # File paths
 QSS_FILEPATH = os.path.join(PACKAGE_PATH, QSS_FILE)
@@ -134,6 +151,7 @@ QRC_FILEPATH = os.path.join(PACKAGE_PATH, QRC_FILE)
 MAIN_SCSS_FILEPATH = os.path.join(QSS_PATH, MAIN_SCSS_FILE)
 STYLES_SCSS_FILEPATH = os.path.join(QSS_PATH, STYLES_SCSS_FILE)
 VARIABLES_SCSS_FILEPATH = os.path.join(QSS_PATH, VARIABLES_SCSS_FILE)
+QSS_TEMPLATE_FILEPATH = os.path.join(QSS_PATH, QSS_TEMPLATE_FILE)
 
 USE_DARWIN_BUTTONS = False
 ALIGN_BUTTONS_LEFT = False
@@ -144,6 +162,44 @@ APP_NAME = None
 # Path to app icon
 APP_ICON_PATH = None
 
+# Maximum number of patched stylesheets kept in memory
+STYLESHEET_CACHE_SIZE = 16
+
+# Patched stylesheets keyed by (style, qt_api, qt_version, platform)
+_stylesheet_cache = OrderedDict()
+_stylesheet_cache_hits = 0
+_stylesheet_cache_misses = 0
+_stylesheet_cache_lock = threading.RLock()
+
+# Palette of currently loaded style
+_current_palette = None
+
+# Maximum number of runtime palettes which icons stay registered
+RUNTIME_PALETTE_CACHE_SIZE = 8
+
+# Icon providers of runtime palettes keyed by palette hash
+_runtime_palettes = OrderedDict()
+
+# Icon providers rendered in background, not registered yet
+_prepared_providers = {}
+_runtime_palettes_lock = threading.RLock()
+
+# Submodules imported on first attribute access, importing package
+# does not import Qt bindings
+_LAZY_SUBMODULES = ('extras', 'palette', 'registry', 'utils', 'widgets', 'windows')
+
+
+def __getattr__(name):
+    """Import submodule on first access, e.g. qrainbowstyle.windows"""
+    if name in _LAZY_SUBMODULES:
+        # import sets module attribute, __getattr__ is not called again
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES))
+
 
 def setAppIcon(icon_path: str):
     """Set path to app icon which will be used in titlebars"""
@@ -163,35 +219,110 @@ def useDarwinButtons():
 
 
 def getAvailableStyles():
-    """Get list of available styles"""
-    return [x for x in os.listdir(STYLES_PATH) if x not in ('__pycache__', '__init__.py')]
+    """Get list of available styles, generated styles and registered palettes"""
+    from qrainbowstyle.registry import get_styles
+    return get_styles()
 
 
 def getAvailablePalettes() -> list:
     """Get list of available palettes"""
-    import qrainbowstyle.palette as source
-    palettes = []
-    for name, obj in inspect.getmembers(source):
-        if inspect.isclass(obj) and issubclass(obj, source.BasePalette) and obj is not source.BasePalette:
-            palettes.append(obj)
-    return palettes
+    from qrainbowstyle.registry import get_palettes
+    return get_palettes()
 
 
 def getCurrentPalette():
     """Returns loaded palette"""
-    try:
-        from style_rc import palette  # noqa
-        return palette
-    except ModuleNotFoundError:
+    if _current_palette is None:
         raise ModuleNotFoundError("Cannot find current palette. Did you load style sheet?")
+    return _current_palette
+
+
+def rainbowize(text, palette=None):
+    """
+    Replaces palette variable names (e.g. COLOR_ACCENT_3) with their values in text.
+
+    Args:
+        text (str or list(str)): Text or batch of texts.
+        palette (BasePalette or dict): Palette to use. Defaults to loaded palette.
+
+    Returns:
+        str or list(str): text or list of texts with replaced names.
+    """
+    from qrainbowstyle.utils.rainbowize import Rainbowizer, get_rainbowizer
+
+    if palette is None:
+        palette = getCurrentPalette()
+    rainbowizer = Rainbowizer(palette) if isinstance(palette, dict) else get_rainbowizer(palette)
 
+    if isinstance(text, str):
+        return rainbowizer.sub(text)
+    return rainbowizer.subAll(text)
 
-def rainbowize(text: str) -> str:
-    """Replaces color names with hashes in text"""
-    color_dict = getCurrentPalette().to_dict()
-    for color in color_dict:
-        text = text.replace(color, str(color_dict[color]))
-    return text
+
+def getStylesheetCacheInfo() -> dict:
+    """Return stylesheet cache statistics.
+
+    Returns:
+        dict: hits, misses, current size and maximum size of the cache.
+    """
+    return {"hits": _stylesheet_cache_hits,
+            "misses": _stylesheet_cache_misses,
+            "size": len(_stylesheet_cache),
+            "maxsize": STYLESHEET_CACHE_SIZE}
+
+
+def clearStylesheetCache(style: str = None):
+    """Invalidate cached stylesheets.
+
+    Args:
+        style (str): Style to invalidate. Not case sensitive.
+                     If not given, the whole cache is cleared
+                     and the hit/miss counters are reset.
+    """
+    global _stylesheet_cache_hits, _stylesheet_cache_misses
+
+    with _stylesheet_cache_lock:
+        if style is None:
+            _stylesheet_cache.clear()
+            _stylesheet_cache_hits = 0
+            _stylesheet_cache_misses = 0
+            _logger.debug("Stylesheet cache cleared")
+        else:
+            for key in [key for key in _stylesheet_cache if key[0].lower() == style.lower()]:
+                del _stylesheet_cache[key]
+            _logger.debug("Stylesheet cache cleared for style: " + style)
+
+
+def clearStylesheetSnapshots():
+    """Remove stylesheet snapshots saved by load_stylesheet(snapshot=True)."""
+    from qrainbowstyle.utils.snapshot import clear_snapshots
+    clear_snapshots()
+
+
+def _get_cached_stylesheet(key):
+    """Return cached stylesheet for key or None and update counters."""
+    global _stylesheet_cache_hits, _stylesheet_cache_misses
+
+    with _stylesheet_cache_lock:
+        stylesheet = _stylesheet_cache.get(key)
+        if stylesheet is None:
+            _stylesheet_cache_misses += 1
+        else:
+            _stylesheet_cache_hits += 1
+            _stylesheet_cache.move_to_end(key)
+    return stylesheet
+
+
+def _set_cached_stylesheet(key, stylesheet):
+    """Store stylesheet in cache evicting the least recently used entries."""
+    if STYLESHEET_CACHE_SIZE <= 0:
+        return
+
+    with _stylesheet_cache_lock:
+        _stylesheet_cache[key] = stylesheet
+        _stylesheet_cache.move_to_end(key)
+        while len(_stylesheet_cache) > STYLESHEET_CACHE_SIZE:
+            _stylesheet_cache.popitem(last=False)
 
 
 def _apply_os_patches(palette):
@@ -201,6 +332,8 @@ def _apply_os_patches(palette):
     Returns:
         str: stylesheet string (css).
     """
+    import platform
+
     os_fix = ""
 
     if platform.system().lower() == 'darwin':
@@ -268,7 +401,7 @@ def _apply_version_patches(qt_version):
     return version_fix
 
 
-def _apply_application_patches(palette, QCoreApplication, QPalette, QColor):
+def _apply_application_patches(palette, QCoreApplication, QPalette):
     """
     Apply application level fixes on the QPalette.
 
@@ -277,8 +410,7 @@ def _apply_application_patches(palette, QCoreApplication, QPalette, QColor):
     that moment for setting reasons.
     """
     # See issue #139
-    color = palette.COLOR_ACCENT_3
-    qcolor = QColor(color)
+    qcolor = palette.frozen().color('COLOR_ACCENT_3')
 
     # Todo: check if it is qcoreapplication indeed
     app = QCoreApplication.instance()
@@ -296,108 +428,28 @@ def _apply_application_patches(palette, QCoreApplication, QPalette, QColor):
                         "instantiation of QApplication to take effect. ")
 
 
-def _load_stylesheet(qt_api='', style=''):
-    """
-    Load the stylesheet based on QtPy abstraction layer environment variable.
-
-    If the argument is not passed, it uses the current QT_API environment
-    variable to make the imports of Qt bindings. If passed, it sets this
-    variable then make the imports.
-
-    Args:
-        qt_api (str): qt binding name to set QT_API environment variable.
-                      Default is ''. Possible values are pyside2, pyside6,
-                      pyqt5. Not case sensitive.
-
-    Note:
-        - Note that the variable QT_API is read when first imported. So,
-          pay attention to the import order.
-        - OS, binding and binding version number, and application specific
-          patches are applied in this order.
+def _read_patched_stylesheet(palette, QFile, QTextStream, qt_version):
+    """Read QSS file from registered resources and apply OS, binding and version patches.
 
     Returns:
         str: stylesheet string (css).
     """
+    from qrainbowstyle.utils.resources import map_shared_resources
 
-    if qt_api:
-        os.environ['QT_API'] = qt_api
-
-    # Import is made after setting QT_API
-    from qtpy.QtCore import QCoreApplication, QFile, QTextStream
-    from qtpy.QtGui import QColor, QPalette
-    from qtpy import QT_VERSION
-
-    # Search for style in styles directory
-    style_dir = None
-
-    available_styles = getAvailableStyles()
-    _logger.debug(f"Available styles: {available_styles}")
-    for stl in available_styles:
-        if style.lower() == stl.lower():
-            style_dir = stl
-            break
-
-    if style_dir is None:
-        stylesheet = ""
-        raise FileNotFoundError("Style " + style + " does not exists")
-
-    # check if any style_rc was loaded before
-    if "style_rc" in sys.modules:
-        _logger.info("Found already imported style in sys.modules")
-
-        # use qCleanupResources to remove all resource files
-        global style_rc  # noqa
-        style_rc.qCleanupResources()
-
-        # remove imported modules
-        for x in [module for module in sys.modules if module.startswith("style_rc")]:
-            del sys.modules[x]
-            del style_rc
-
-        # remove path to previously imported style from sys.path
-        for stylepath in [path for path in sys.path if any(style for style in getAvailableStyles() if style in path)]:
-            sys.path.remove(stylepath)
-        _logger.debug("Removed all imported styles")
-
-    try:
-        _logger.debug("Loading style from directory: " + style_dir)
-        old_working_dir = os.getcwd()
-        # set style directory
-        package_dir = os.path.join(STYLES_PATH, style_dir)
-        os.chdir(package_dir)
-
-        # append directory to sys.path and import style_rc
-        sys.path.append(package_dir)
-        try:
-            import style_rc  # noqa
-            # get palette
-            palette = style_rc.palette
-
-        except ModuleNotFoundError:
-            raise ModuleNotFoundError("Failed to import style_rc from directory: {}".format(package_dir))
-
-        finally:
-            os.chdir(old_working_dir)
-
-    except FileExistsError:
-        raise FileNotFoundError("Missing style_rc.py file")
-
-    _logger.info("Style resources imported successfully")
-
-    # Thus, by importing the binary we can access the resources
+    # Thus, by registering the resources we can access them
     package_dir = os.path.basename(PACKAGE_PATH)
     qss_rc_path = ":" + os.path.join(package_dir, QSS_FILE)
 
     _logger.debug("Reading QSS file in: %s", qss_rc_path)
 
-    # It gets the qss file from compiled style_rc that was import
+    # It gets the qss file from compiled style_rc that was registered
     # not from the file QSS as we are using resources
     qss_file = QFile(qss_rc_path)
 
     if qss_file.exists():
         qss_file.open(QFile.ReadOnly | QFile.Text)
         text_stream = QTextStream(qss_file)
-        stylesheet = text_stream.readAll()
+        stylesheet = map_shared_resources(text_stream.readAll())
         _logger.info("QSS file sucessfuly loaded.")
     else:
         stylesheet = ""
@@ -405,6 +457,15 @@ def _load_stylesheet(qt_api='', style=''):
         raise FileNotFoundError("Unable to find QSS file '{}' "
                                 "in resources.".format(qss_rc_path))
 
+    return _apply_stylesheet_patches(stylesheet, palette, qt_version)
+
+
+def _apply_stylesheet_patches(stylesheet, palette, qt_version):
+    """Apply OS, binding and version patches to stylesheet.
+
+    Returns:
+        str: stylesheet string (css).
+    """
     _logger.debug("Checking patches for being applied.")
 
     # Todo: check execution order for these functions
@@ -415,15 +476,237 @@ def _load_stylesheet(qt_api='', style=''):
     stylesheet += _apply_binding_patches()
 
     # 3. Apply binding version specific patches
-    stylesheet += _apply_version_patches(QT_VERSION)
+    stylesheet += _apply_version_patches(qt_version)
+
+    return stylesheet
+
+
+def _get_palette_hash(palette):
+    """Return hash of all variables of palette."""
+    import hashlib
+    import json
+
+    variables = {name: str(getattr(palette, name)) for name in dir(palette) if name.isupper()}
+    return hashlib.sha1(json.dumps(variables, sort_keys=True).encode()).hexdigest()
+
+
+def _create_runtime_palette(palette):
+    """Return palette class from palette class or dictionary of palette variables."""
+    import inspect
+    from qrainbowstyle.palette import BasePalette
+
+    if isinstance(palette, dict):
+        return type('RuntimePalette', (BasePalette,), dict(palette))
+    if inspect.isclass(palette) and issubclass(palette, BasePalette):
+        return palette
+    raise TypeError("Palette must be BasePalette subclass or dict, not {}".format(type(palette).__name__))
+
+
+def _render_palette_stylesheet(provider, qt_version):
+    """Return stylesheet of runtime palette using icons of provider, with patches applied."""
+    from qrainbowstyle.utils.template import render_qss
+
+    variables = provider.palette.to_dict()
+    variables['PATH_RESOURCES'] = "'{}'".format(provider.resourcePath())
+    return _apply_stylesheet_patches(render_qss(variables), provider.palette, qt_version)
+
+
+def _load_palette_stylesheet(palette, qt_version):
+    """
+    Render stylesheet of runtime palette from template and register its icons.
+
+    Icons are rendered and registered as in-memory resources once per
+    palette hash, the least recently used palettes are unregistered.
+    Icons rendered in background by _prepare_stylesheet are reused.
+
+    Returns:
+        tuple: palette class and stylesheet string (css) with patches applied.
+    """
+    import platform
+    from qtpy import API
+    from qrainbowstyle.utils.icons import IconProvider
+
+    palette = _create_runtime_palette(palette)
+    palette_hash = _get_palette_hash(palette)
+
+    with _runtime_palettes_lock:
+        provider = _runtime_palettes.get(palette_hash)
+        if provider is None:
+            provider = _prepared_providers.pop(palette_hash, None) or IconProvider(palette)
+            _runtime_palettes[palette_hash] = provider
+            while len(_runtime_palettes) > max(RUNTIME_PALETTE_CACHE_SIZE, 1):
+                evicted_hash, evicted = _runtime_palettes.popitem(last=False)
+                evicted.unregister()
+                # stylesheets refer to resource path of evicted provider
+                with _stylesheet_cache_lock:
+                    for stale_key in [k for k in _stylesheet_cache if k[0] == evicted_hash]:
+                        del _stylesheet_cache[stale_key]
+        else:
+            _runtime_palettes.move_to_end(palette_hash)
+    provider.register()
+
+    key = (palette_hash, API, qt_version, platform.system())
+    stylesheet = _get_cached_stylesheet(key)
+    if stylesheet is None:
+        stylesheet = _render_palette_stylesheet(provider, qt_version)
+        _set_cached_stylesheet(key, stylesheet)
+    else:
+        _logger.debug("Using cached stylesheet for palette: " + palette_hash)
+
+    return provider.palette, stylesheet
+
+
+def _prepare_stylesheet(style='', palette=None, ratios=None):
+    """
+    Prepare stylesheet of style or palette in cache, can be called from any thread.
+
+    Stylesheet is read and patched and icons of runtime palettes are
+    rendered, but no resources are registered, so style in use is not
+    affected. load_stylesheet called later from GUI thread finds
+    stylesheet in cache. Stylesheet of style is read from its loose
+    QSS file or from its binary resources, styles with only style_rc module
+    are left to load_stylesheet.
+
+    Args:
+        style (str): Style name, not case sensitive.
+        palette (BasePalette or dict): Runtime palette, if given style is
+                      ignored.
+        ratios (list(int)): High DPI variants of icons of runtime palette.
+    """
+    import platform
+    from qtpy import API, QT_VERSION
+    from qrainbowstyle.registry import find_palette, find_style
+    from qrainbowstyle.utils.icons import IconProvider
+    from qrainbowstyle.utils.resources import map_shared_resources, read_style_qss
+
+    if palette is None:
+        style_dir = find_style(style)
+        if style_dir is not None:
+            key = (style_dir, API, QT_VERSION, platform.system())
+            palette = find_palette(style_dir)
+            with _stylesheet_cache_lock:
+                cached = key in _stylesheet_cache
+            if cached or palette is None:
+                return
+
+            stylesheet = read_style_qss(style_dir)
+            if stylesheet is None:
+                return
+            stylesheet = map_shared_resources(stylesheet, style_dir)
+            _set_cached_stylesheet(key, _apply_stylesheet_patches(stylesheet, palette, QT_VERSION))
+            _logger.debug("Prepared stylesheet of style: " + style_dir)
+            return
+
+        palette = find_palette(style)
+        if palette is None:
+            raise FileNotFoundError("Style " + style + " does not exists")
+
+    palette = _create_runtime_palette(palette)
+    palette_hash = _get_palette_hash(palette)
+
+    with _runtime_palettes_lock:
+        provider = _runtime_palettes.get(palette_hash) or _prepared_providers.get(palette_hash)
+        if provider is None:
+            provider = _prepared_providers[palette_hash] = IconProvider(palette)
+    provider.prepare(ratios)
+
+    key = (palette_hash, API, QT_VERSION, platform.system())
+    with _runtime_palettes_lock:
+        # provider could be evicted while icons were rendered
+        if provider in (_runtime_palettes.get(palette_hash), _prepared_providers.get(palette_hash)):
+            _set_cached_stylesheet(key, _render_palette_stylesheet(provider, QT_VERSION))
+    _logger.debug("Prepared stylesheet of palette: " + palette_hash)
+
+
+def _load_stylesheet(qt_api='', style='', palette=None, snapshot=False):
+    """
+    Load the stylesheet based on QtPy abstraction layer environment variable.
+
+    If the argument is not passed, it uses the current QT_API environment
+    variable to make the imports of Qt bindings. If passed, it sets this
+    variable then make the imports.
+
+    Args:
+        qt_api (str): qt binding name to set QT_API environment variable.
+                      Default is ''. Possible values are pyside2, pyside6,
+                      pyqt5. Not case sensitive.
+        style (str): Style name, not case sensitive.
+        palette (BasePalette or dict): Runtime palette, if given style is
+                      ignored.
+        snapshot (bool): Load generated style from snapshot file, snapshot
+                      is written if it does not exist or is outdated.
+
+    Note:
+        - Note that the variable QT_API is read when first imported. So,
+          pay attention to the import order.
+        - OS, binding and binding version number, and application specific
+          patches are applied in this order.
+
+    Returns:
+        str: stylesheet string (css).
+    """
+    global _current_palette
+
+    if qt_api:
+        os.environ['QT_API'] = qt_api
+
+    import platform
+
+    # Import is made after setting QT_API
+    from qtpy.QtCore import QCoreApplication, QFile, QTextStream
+    from qtpy.QtGui import QPalette
+    from qtpy import API, QT_VERSION
+    from qrainbowstyle.registry import find_palette, find_style
+    from qrainbowstyle.utils.resources import register_style_resources
+
+    if palette is not None:
+        _current_palette, stylesheet = _load_palette_stylesheet(palette, QT_VERSION)
+        _apply_application_patches(_current_palette, QCoreApplication, QPalette)
+        return stylesheet
+
+    # Search for style in styles directory, registered palettes without
+    # generated style are rendered at runtime
+    style_dir = find_style(style)
+
+    if style_dir is None:
+        palette = find_palette(style)
+        if palette is None:
+            raise FileNotFoundError("Style " + style + " does not exists")
+        _current_palette, stylesheet = _load_palette_stylesheet(palette, QT_VERSION)
+        _apply_application_patches(_current_palette, QCoreApplication, QPalette)
+        return stylesheet
+
+    key = (style_dir, API, QT_VERSION, platform.system())
+    stylesheet = _get_cached_stylesheet(key)
+
+    if stylesheet is None and snapshot:
+        from qrainbowstyle.utils.snapshot import load_snapshot, save_snapshot
+
+        loaded = load_snapshot(key)
+        if loaded is not None:
+            palette, stylesheet = loaded
+            _current_palette = palette = register_style_resources(style_dir, palette)
+            _set_cached_stylesheet(key, stylesheet)
+        else:
+            _current_palette = palette = register_style_resources(style_dir)
+            stylesheet = _read_patched_stylesheet(palette, QFile, QTextStream, QT_VERSION)
+            _set_cached_stylesheet(key, stylesheet)
+            save_snapshot(key, palette, stylesheet)
+    else:
+        _current_palette = palette = register_style_resources(style_dir)
+        if stylesheet is None:
+            stylesheet = _read_patched_stylesheet(palette, QFile, QTextStream, QT_VERSION)
+            _set_cached_stylesheet(key, stylesheet)
+        else:
+            _logger.debug("Using cached stylesheet for style: " + style_dir)
 
     # 4. Apply palette fix. See issue #139
-    _apply_application_patches(palette, QCoreApplication, QPalette, QColor)
+    _apply_application_patches(palette, QCoreApplication, QPalette)
 
     return stylesheet
 
 
-def load_stylesheet(qt_api="", style='qdarkstyle3'):
+def load_stylesheet(qt_api="", style='qdarkstyle3', palette=None, snapshot=False):
     """
     Load the stylesheet. Takes care of importing the rc module.
 
@@ -435,6 +718,17 @@ def load_stylesheet(qt_api="", style='qdarkstyle3'):
 
         style (str): Style to use. Default is 'darkblue'
 
+        palette (BasePalette or dict): Palette class or dictionary of palette
+                      variables used instead of style. Stylesheet is rendered
+                      from template and icons are registered in memory, no
+                      generated files are needed.
+
+        snapshot (bool): Reuse patched stylesheet and palette of style saved
+                      in user cache directory by previous load, see
+                      qrainbowstyle.utils.snapshot. Faster startup, palette
+                      returned by getCurrentPalette is restored from
+                      snapshot. Not used with palette.
+
     Returns:
         str: the stylesheet string.
     """
@@ -442,9 +736,52 @@ def load_stylesheet(qt_api="", style='qdarkstyle3'):
     stylesheet = ""
 
     if qt_api:
-        stylesheet = _load_stylesheet(qt_api=qt_api, style=style)
+        stylesheet = _load_stylesheet(qt_api=qt_api, style=style, palette=palette, snapshot=snapshot)
 
     else:
-        stylesheet = _load_stylesheet(qt_api='pyqt5', style=style)
+        stylesheet = _load_stylesheet(qt_api='pyqt5', style=style, palette=palette, snapshot=snapshot)
 
     return stylesheet
+
+
+def load_stylesheet_async(qt_api="", style='qdarkstyle3', palette=None, apply=True):
+    """
+    Load the stylesheet in background. Must be called from GUI thread.
+
+    Style lookup, reading and patching of stylesheet and rendering of icons
+    run on worker thread, then resources are registered and stylesheet is
+    set on QApplication on GUI thread. For Qt signals use loader returned by
+    qrainbowstyle.utils.loader.get_stylesheet_loader().
+
+    Args:
+        qt_api (str): Qt binding name, see load_stylesheet().
+        style (str): Style to use.
+        palette (BasePalette or dict): Palette used instead of style, see
+                      load_stylesheet().
+        apply (bool): Set stylesheet on QApplication when it is loaded.
+
+    Returns:
+        concurrent.futures.Future: resolved on GUI thread with the
+        stylesheet string.
+    """
+    os.environ['QT_API'] = qt_api or 'pyqt5'
+
+    from qrainbowstyle.utils.loader import get_stylesheet_loader
+    return get_stylesheet_loader().load(qt_api=qt_api, style=style, palette=palette, apply=apply)
+
+
+def prefetchStylesheets(themes, qt_api=""):
+    """
+    Prepare stylesheets of themes in background, so later loading is fast.
+
+    Args:
+        themes (list): Style names or palettes.
+        qt_api (str): Qt binding name, see load_stylesheet().
+
+    Returns:
+        list(concurrent.futures.Future): futures resolved when themes are prepared.
+    """
+    os.environ['QT_API'] = qt_api or 'pyqt5'
+
+    from qrainbowstyle.utils.loader import get_stylesheet_loader
+    return get_stylesheet_loader().prefetch(themes)
@@ -3,6 +3,9 @@
 """QRainbowStyle default palette."""
 
 # Standard library imports
+import threading
+import weakref
+from array import array
 from collections import OrderedDict
 
 # package imports
@@ -53,6 +56,13 @@ class BasePalette:
     # Paths
     PATH_RESOURCES = "':/qss_icons'"
 
+    def __init_subclass__(cls, register=False, **kwargs):
+        """Register palette created with register=True, see qrainbowstyle.registry."""
+        super().__init_subclass__(**kwargs)
+        if register:
+            from qrainbowstyle.registry import register_palette
+            register_palette(cls)
+
     @classmethod
     def to_dict(cls, colors_only=False):
         """Convert variables to dictionary."""
@@ -103,8 +113,168 @@ class BasePalette:
         """Return the ordered colored palette dictionary."""
         return cls.to_dict(colors_only=True)
 
-
-class Oceanic(BasePalette):
+    @classmethod
+    def frozen(cls):
+        """Return frozen palette with parsed colors, it is created once per palette."""
+        with _frozen_lock:
+            frozen = _frozen_palettes.get(cls)
+            if frozen is None:
+                frozen = _frozen_palettes[cls] = FrozenPalette(cls)
+        return frozen
+
+
+def _parse_color(value):
+    """Return color '#rgb', '#rrggbb' or '#rrggbbaa' as 0xRRGGBBAA integer or None."""
+    if not isinstance(value, str) or not value.startswith('#'):
+        return None
+    digits = value[1:]
+    if len(digits) == 3:
+        digits = ''.join(digit * 2 for digit in digits)
+    if len(digits) == 6:
+        digits += 'ff'
+    if len(digits) != 8:
+        return None
+    try:
+        return int(digits, 16)
+    except ValueError:
+        return None
+
+
+# Frozen palettes keyed by palette class, released together with runtime palette classes
+_frozen_palettes = weakref.WeakKeyDictionary()
+_frozen_lock = threading.Lock()
+
+# Roles of QPalette built by FrozenPalette.qpalette(), (group, role, variable)
+# group None sets color for all groups, disabled group is set after them
+QPALETTE_ROLES = (
+    (None, 'Window', 'COLOR_BACKGROUND_1'),
+    (None, 'WindowText', 'COLOR_TEXT_1'),
+    (None, 'Base', 'COLOR_BACKGROUND_1'),
+    (None, 'AlternateBase', 'COLOR_BACKGROUND_2'),
+    (None, 'ToolTipBase', 'COLOR_ACCENT_2'),
+    (None, 'ToolTipText', 'COLOR_TEXT_1'),
+    (None, 'Text', 'COLOR_TEXT_1'),
+    (None, 'Button', 'COLOR_BACKGROUND_4'),
+    (None, 'ButtonText', 'COLOR_TEXT_1'),
+    (None, 'Highlight', 'COLOR_ACCENT_2'),
+    (None, 'HighlightedText', 'COLOR_TEXT_1'),
+    (None, 'Link', 'COLOR_ACCENT_3'),
+    (None, 'LinkVisited', 'COLOR_ACCENT_4'),
+    ('Disabled', 'WindowText', 'COLOR_TEXT_4'),
+    ('Disabled', 'Text', 'COLOR_TEXT_4'),
+    ('Disabled', 'ButtonText', 'COLOR_TEXT_4'),
+    ('Disabled', 'Highlight', 'COLOR_ACCENT_1'),
+    ('Disabled', 'HighlightedText', 'COLOR_TEXT_4'),
+)
+
+
+class FrozenPalette:
+    """Immutable palette with colors parsed once.
+
+    All colors of palette are parsed to RGBA integers on creation.
+    QColor and QBrush objects and QPalette are created once on first use and
+    shared by all consumers, they must be copied before modifying.
+    Other variables are accessible as attributes like on palette class.
+
+    Args:
+        palette (BasePalette): Palette class.
+    """
+
+    __slots__ = ('_palette', 'name', '_values', '_index', '_rgba', '_colors', '_brushes', '_qpalette')
+
+    def __init__(self, palette):
+        values = {name: getattr(palette, name) for name in dir(palette) if name.isupper()}
+
+        index = {}
+        rgba = array('I')
+        for name in sorted(values):
+            parsed = _parse_color(values[name])
+            if parsed is not None:
+                index[name] = len(rgba)
+                rgba.append(parsed)
+
+        set_attribute = super(FrozenPalette, self).__setattr__
+        # weak reference, frozen palettes are kept only while their palette class exists
+        set_attribute('_palette', weakref.ref(palette))
+        set_attribute('name', palette.__name__)
+        set_attribute('_values', values)
+        set_attribute('_index', index)
+        set_attribute('_rgba', rgba)
+        set_attribute('_colors', [None] * len(rgba))
+        set_attribute('_brushes', [None] * len(rgba))
+        set_attribute('_qpalette', None)
+
+    @property
+    def palette(self):
+        """Palette class of frozen palette."""
+        return self._palette()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenPalette is immutable")
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError("Palette {} has no variable {}".format(self.name, name))
+
+    def __repr__(self):
+        return "<FrozenPalette {}>".format(self.name)
+
+    def colorNames(self) -> list:
+        """Return names of color variables."""
+        return list(self._index)
+
+    def rgba(self, name) -> int:
+        """Return color as 0xRRGGBBAA integer."""
+        try:
+            return self._rgba[self._index[name]]
+        except KeyError:
+            raise KeyError("Palette {} has no color {}".format(self.name, name))
+
+    def color(self, name):
+        """Return shared QColor of color variable, e.g. color('COLOR_ACCENT_4')."""
+        from qtpy.QtGui import QColor
+
+        index = self._index.get(name)
+        if index is None:
+            raise KeyError("Palette {} has no color {}".format(self.name, name))
+        color = self._colors[index]
+        if color is None:
+            value = self._rgba[index]
+            color = self._colors[index] = QColor(value >> 24, (value >> 16) & 0xff, (value >> 8) & 0xff, value & 0xff)
+        return color
+
+    def brush(self, name):
+        """Return shared QBrush of color variable."""
+        from qtpy.QtGui import QBrush
+
+        index = self._index.get(name)
+        if index is None:
+            raise KeyError("Palette {} has no color {}".format(self.name, name))
+        brush = self._brushes[index]
+        if brush is None:
+            brush = self._brushes[index] = QBrush(self.color(name))
+        return brush
+
+    def qpalette(self):
+        """Return shared QPalette with colors of this palette, see QPALETTE_ROLES."""
+        from qtpy.QtGui import QPalette
+
+        if self._qpalette is None:
+            qpalette = QPalette()
+            for group, role, name in QPALETTE_ROLES:
+                if name not in self._index:
+                    continue
+                if group is None:
+                    qpalette.setBrush(getattr(QPalette, role), self.brush(name))
+                else:
+                    qpalette.setBrush(getattr(QPalette, group), getattr(QPalette, role), self.brush(name))
+            super(FrozenPalette, self).__setattr__('_qpalette', qpalette)
+        return self._qpalette
+
+
+class Oceanic(BasePalette, register=True):
     """Theme variables."""
     COLOR_BACKGROUND_1 = "#263238"
     COLOR_BACKGROUND_2 = "#2f4048"
@@ -132,7 +302,7 @@ class Oceanic(BasePalette):
     OPACITY_TOOLTIP = 230
 
 
-class QDarkStyle(BasePalette):
+class QDarkStyle(BasePalette, register=True):
     COLOR_BACKGROUND_1 = "#19232d"
     COLOR_BACKGROUND_2 = "#27323c"
     COLOR_BACKGROUND_3 = "#35414b"
@@ -159,7 +329,7 @@ class QDarkStyle(BasePalette):
     OPACITY_TOOLTIP = 230
 
 
-class DarkOrange(BasePalette):
+class DarkOrange(BasePalette, register=True):
     COLOR_BACKGROUND_1 = Gray.B10
     COLOR_BACKGROUND_2 = Gray.B20
     COLOR_BACKGROUND_3 = Gray.B30
@@ -186,7 +356,7 @@ class DarkOrange(BasePalette):
     OPACITY_TOOLTIP = 230
 
 
-class LightOrange(BasePalette):
+class LightOrange(BasePalette, register=True):
     COLOR_BACKGROUND_1 = Gray.B140
     COLOR_BACKGROUND_2 = Gray.B130
     COLOR_BACKGROUND_3 = Gray.B120
@@ -213,7 +383,7 @@ class LightOrange(BasePalette):
     OPACITY_TOOLTIP = 230
 
 
-class QDarkStyle3Light(BasePalette):
+class QDarkStyle3Light(BasePalette, register=True):
     COLOR_BACKGROUND_1 = Gray.B140
     COLOR_BACKGROUND_2 = Gray.B130
     COLOR_BACKGROUND_3 = Gray.B120
@@ -240,7 +410,7 @@ class QDarkStyle3Light(BasePalette):
     OPACITY_TOOLTIP = 230
 
 
-class QDarkStyle3(BasePalette):
+class QDarkStyle3(BasePalette, register=True):
     COLOR_BACKGROUND_1 = Gray.B10
     COLOR_BACKGROUND_2 = Gray.B20
     COLOR_BACKGROUND_3 = Gray.B30
@@ -267,7 +437,7 @@ class QDarkStyle3(BasePalette):
     OPACITY_TOOLTIP = 230
 
 
-class PWRDark(BasePalette):
+class PWRDark(BasePalette, register=True):
     COLOR_BACKGROUND_1 = Gray.B10
     COLOR_BACKGROUND_2 = Gray.B20
     COLOR_BACKGROUND_3 = Gray.B30
@@ -294,7 +464,7 @@ class PWRDark(BasePalette):
     OPACITY_TOOLTIP = 230
 
 
-class PWRLight(BasePalette):
+class PWRLight(BasePalette, register=True):
     COLOR_BACKGROUND_1 = Gray.B140
     COLOR_BACKGROUND_2 = Gray.B130
     COLOR_BACKGROUND_3 = Gray.B120
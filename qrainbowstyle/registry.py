@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Registry of palettes and styles.
+
+Palettes are registered explicitly, with ``register_palette`` or by
+creating subclass of ``BasePalette`` with ``register=True``, e.g.
+``class MyPalette(BasePalette, register=True)``. Other subclasses, like
+palettes derived in user code or tests, are not registered. Palettes of
+other packages are loaded from
+``qrainbowstyle.palettes`` entry points, entry point can refer to palette
+class or module defining palettes, e.g.
+
+.. code-block:: ini
+
+    [options.entry_points]
+    qrainbowstyle.palettes =
+        MyPalette = mypackage.palettes:MyPalette
+
+Styles are directories of generated resources in styles folder, they are
+listed once. All names are looked up case insensitive.
+"""
+
+# Standard library imports
+import inspect
+import logging
+import os
+import threading
+
+# Local imports
+from qrainbowstyle import STYLES_PATH
+
+ENTRY_POINT_GROUP = 'qrainbowstyle.palettes'
+
+_logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+
+# Lower case names to palette classes and registered names
+_palettes = {}
+_palette_names = {}
+
+# Lower case names to style directory names, listed on first use
+_styles = {"dirs": None, "entry_points_loaded": False}
+
+
+def register_palette(palette, name=None):
+    """
+    Register palette class.
+
+    Args:
+        palette (BasePalette): Palette class.
+        name (str): Palette name. Defaults to class name.
+
+    Palette replaces registered class with the same module and qualified
+    name, e.g. when module defining it is reloaded.
+
+    Raises:
+        ValueError: Other palette is registered with the same name.
+    """
+    name = name or palette.__name__
+    with _lock:
+        registered = _palettes.get(name.lower())
+        if registered is not None and not _is_same_definition(registered, palette):
+            raise ValueError("Palette {} is already registered".format(name))
+        _palettes[name.lower()] = palette
+        _palette_names[name.lower()] = name
+    _logger.debug("Registered palette: %s", name)
+
+
+def _is_same_definition(registered, palette):
+    """Return True if palette is registered class or its new definition from reloaded module."""
+    return registered is palette or (registered.__module__ == palette.__module__
+                                     and registered.__qualname__ == palette.__qualname__)
+
+
+def unregister_palette(name):
+    """Unregister palette with name, not case sensitive."""
+    with _lock:
+        _palettes.pop(name.lower(), None)
+        _palette_names.pop(name.lower(), None)
+
+
+def _iter_entry_points():
+    """Return entry points of palettes."""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            import pkg_resources
+        except ImportError:
+            return []
+        return list(pkg_resources.iter_entry_points(ENTRY_POINT_GROUP))
+
+    points = entry_points()
+    if hasattr(points, 'select'):
+        return list(points.select(group=ENTRY_POINT_GROUP))
+    return list(points.get(ENTRY_POINT_GROUP, []))
+
+
+def _load_palettes():
+    """Import bundled palettes and palettes from entry points once."""
+    # bundled palettes register on import
+    import qrainbowstyle.palette
+
+    with _lock:
+        if _styles["entry_points_loaded"]:
+            return
+        _styles["entry_points_loaded"] = True
+
+        for entry_point in _iter_entry_points():
+            try:
+                loaded = entry_point.load()
+            except Exception:
+                _logger.exception("Failed to load palette entry point: %s", entry_point.name)
+                continue
+            if inspect.isclass(loaded):
+                palettes = {entry_point.name: loaded}
+            elif inspect.ismodule(loaded):
+                # palettes defined in module
+                palettes = {obj.__name__: obj for obj in vars(loaded).values()
+                            if inspect.isclass(obj) and obj.__module__ == loaded.__name__}
+            else:
+                palettes = {}
+
+            for name, palette in palettes.items():
+                if not issubclass(palette, qrainbowstyle.palette.BasePalette):
+                    continue
+                try:
+                    register_palette(palette, name)
+                except ValueError:
+                    _logger.warning("Palette %s of entry point %s is already registered", name, entry_point.name)
+
+
+def get_palettes():
+    """Return registered palette classes sorted by name."""
+    _load_palettes()
+    with _lock:
+        return [_palettes[name] for name in sorted(_palettes)]
+
+
+def find_palette(name):
+    """Return palette class with name or None, not case sensitive."""
+    _load_palettes()
+    return _palettes.get(name.lower())
+
+
+def _style_dirs():
+    """Return lower case names to style directory names, directory is listed once."""
+    with _lock:
+        if _styles["dirs"] is None:
+            _styles["dirs"] = {
+                entry.name.lower(): entry.name for entry in os.scandir(STYLES_PATH)
+                if entry.is_dir() and entry.name != '__pycache__'
+            }
+        return _styles["dirs"]
+
+
+def refresh_styles():
+    """List styles directory again on next lookup."""
+    with _lock:
+        _styles["dirs"] = None
+
+
+def get_styles():
+    """Return names of generated styles and registered palettes without generated style, sorted."""
+    names = dict(_style_dirs())
+    _load_palettes()
+    with _lock:
+        for key, name in _palette_names.items():
+            names.setdefault(key, name)
+    return [names[key] for key in sorted(names)]
+
+
+def find_style(name):
+    """Return directory name of generated style or None, not case sensitive."""
+    return _style_dirs().get(name.lower())
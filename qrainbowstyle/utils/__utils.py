@@ -1,11 +1,11 @@
 from qtpy.QtWidgets import QApplication
 import qrainbowstyle
+from qrainbowstyle.utils.switcher import StyleSwitcher
 
 
 def setStylesheetOnQApp(style):
-    """Set stylesheet on current app."""
-    app = QApplication.instance()
-    app.setStyleSheet(qrainbowstyle.load_stylesheet(style=style))
+    """Set stylesheet on current app, widgets are not re-polished if style did not change."""
+    return StyleSwitcher(QApplication.instance()).switch(style=style)
 
 
 class StyleLooper:
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Runtime rendering of svg icons tinted with palette colors.
+
+Icons are rendered on demand from base svg files and kept in a LRU cache
+keyed by icon, state, size and device pixel ratio. All icons of a palette
+can be registered as in-memory resources, so stylesheets can use them
+without pre-rendered png files.
+"""
+
+# Standard library imports
+import hashlib
+import itertools
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+
+# Third party imports
+from qtpy.QtCore import QBuffer, QByteArray, QIODevice, QRectF, QResource, QSize, Qt
+from qtpy.QtGui import QGuiApplication, QImage, QPainter, QPixmap
+from qtpy.QtSvg import QSvgRenderer
+
+# Local imports
+from qrainbowstyle import BUTTONS_DARWIN_PATH, BUTTONS_NT_PATH, SVG_PATH
+from qrainbowstyle.utils.resources import create_rcc_data
+
+ICON_BLACKLIST = ['base_palette']
+
+# Hardcoded in base svg files
+BASE_COLOR = '#ff0000'
+
+ICON_SIZE = (32, 32)
+NT_BUTTON_SIZE = (45, 30)
+DARWIN_BUTTON_SIZE = (32, 32)
+
+ICON_STATES = ('', '_disabled', '_focus', '_pressed')
+
+ICON_CACHE_SIZE = 1024
+
+RUNTIME_RESOURCE_ROOT = '/qrainbowstyle_runtime'
+
+_logger = logging.getLogger(__name__)
+
+# Contents of base svg files by path, with modification time and size of read file
+_svg_sources = {}
+_svg_lock = threading.Lock()
+
+# Every provider registers its icons under its own resource path
+_provider_ids = itertools.count()
+
+
+def read_svg(svg_path):
+    """Return contents of svg file, file is read again only when it was changed."""
+    stat = os.stat(svg_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _svg_lock:
+        cached = _svg_sources.get(svg_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with open(svg_path, 'r') as fh:
+            data = fh.read()
+        _svg_sources[svg_path] = (stamp, data)
+    return data
+
+
+def render_svg(data, width, height, ratio=1.0):
+    """
+    Render svg contents to image.
+
+    Like QIcon.pixmap, svg aspect ratio is kept, so image may be smaller
+    than requested size.
+
+    Args:
+        data (str): Svg file contents.
+        width (int): Image width in device independent pixels.
+        height (int): Image height in device independent pixels.
+        ratio (float): Device pixel ratio. Defaults to 1.0.
+
+    Returns:
+        QImage: rendered image.
+    """
+    renderer = QSvgRenderer(QByteArray(data.encode()))
+    size = QSize(width, height)
+    if not renderer.defaultSize().isEmpty():
+        size = renderer.defaultSize().scaled(size, Qt.KeepAspectRatio)
+
+    image = QImage(int(round(size.width() * ratio)), int(round(size.height() * ratio)), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+
+    painter = QPainter(image)
+    renderer.render(painter, QRectF(0, 0, image.width(), image.height()))
+    painter.end()
+
+    image.setDevicePixelRatio(ratio)
+    return image
+
+
+def image_to_png(image):
+    """Return png encoded image data."""
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(buffer.data())
+
+
+def _get_state_color_map(palette):
+    """Return map of icon states to color from given palette."""
+    return {
+        '': palette.COLOR_TEXT_1,
+        '_disabled': palette.COLOR_BACKGROUND_4,
+        '_focus': palette.COLOR_ACCENT_5,
+        '_pressed': palette.COLOR_ACCENT_2,
+    }
+
+
+def _get_nt_button_color_map(palette):
+    """Return map of titlebar buttons svg placeholders to color from given palette."""
+    return {
+        "TITLE_BAR_BUTTONS_DISABLED_COLOR": palette.TITLE_BAR_BUTTONS_DISABLED_COLOR,
+        "COLOR_BACKGROUND_DARK": palette.TITLE_BAR_BACKGROUND_COLOR,
+        "COLOR_BACKGROUND_NORMAL": palette.TITLE_BAR_BUTTONS_HOVER_COLOR,
+        "COLOR_FOREGROUND_LIGHT": palette.TITLE_BAR_TEXT_COLOR,
+    }
+
+
+def _svg_fnames(path):
+    return sorted(f for f in os.listdir(path) if f.endswith('.svg'))
+
+
+def _screen_ratios():
+    """Return high DPI variants needed by connected screens, @2x is always included."""
+    max_ratio = 2
+    if QGuiApplication.instance() is not None:
+        for screen in QGuiApplication.screens():
+            max_ratio = max(max_ratio, int(math.ceil(screen.devicePixelRatio())))
+    return list(range(2, max_ratio + 1))
+
+
+class IconProvider:
+    """Render icons tinted with palette colors.
+
+    Args:
+        palette (BasePalette): Palette used to tint icons.
+        cache_size (int): Maximum number of rendered images kept in cache.
+    """
+
+    def __init__(self, palette, cache_size=ICON_CACHE_SIZE):
+        super(IconProvider, self).__init__()
+        self.palette = palette
+        self.cache_size = cache_size
+
+        self.__cache = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__resource_data = None
+        self.__registered = False
+        self.__resource_lock = threading.Lock()
+
+        colors = _get_state_color_map(palette)
+        colors.update(_get_nt_button_color_map(palette))
+        self.__key = "{}_{}".format(hashlib.sha1(repr(sorted(colors.items())).encode()).hexdigest()[:16],
+                                    next(_provider_ids))
+
+        # icon name -> (svg path, default size, has states)
+        self.__icons = OrderedDict()
+        for fname in _svg_fnames(SVG_PATH):
+            name = fname[:-len('.svg')]
+            if name not in ICON_BLACKLIST:
+                self.__icons[name] = (os.path.join(SVG_PATH, fname), ICON_SIZE, True)
+        for fname in _svg_fnames(BUTTONS_NT_PATH):
+            self.__icons[fname[:-len('.svg')]] = (os.path.join(BUTTONS_NT_PATH, fname), NT_BUTTON_SIZE, False)
+        for fname in _svg_fnames(BUTTONS_DARWIN_PATH):
+            self.__icons[fname[:-len('.svg')]] = (os.path.join(BUTTONS_DARWIN_PATH, fname), DARWIN_BUTTON_SIZE, False)
+
+    def icons(self) -> list:
+        """Return names of available icons."""
+        return list(self.__icons)
+
+    def cacheInfo(self) -> dict:
+        """Return cache statistics."""
+        return {"hits": self.__hits, "misses": self.__misses,
+                "size": len(self.__cache), "maxsize": self.cache_size}
+
+    def clearCache(self):
+        """Remove all rendered images from cache."""
+        with self.__lock:
+            self.__cache.clear()
+
+    def resourcePath(self) -> str:
+        """Return resource path of registered icons, e.g. ':/qrainbowstyle_runtime/<key>'."""
+        return ':' + RUNTIME_RESOURCE_ROOT + '/' + self.__key
+
+    def __tinted_svg(self, icon, state):
+        try:
+            svg_path, size, has_states = self.__icons[icon]
+        except KeyError:
+            raise KeyError("Icon {} does not exist".format(icon))
+
+        data = read_svg(svg_path)
+        if has_states:
+            data = data.replace(BASE_COLOR, _get_state_color_map(self.palette)[state])
+        elif state:
+            raise KeyError("Icon {} has no states".format(icon))
+        elif svg_path.startswith(BUTTONS_NT_PATH):
+            for placeholder, color in _get_nt_button_color_map(self.palette).items():
+                data = data.replace(placeholder, color)
+        return data, size
+
+    def image(self, icon, state='', size=None, ratio=1.0) -> QImage:
+        """
+        Return icon tinted with palette color for state.
+
+        Args:
+            icon (str): Icon name, e.g. 'arrow_down'.
+            state (str): One of '', '_disabled', '_focus', '_pressed'.
+            size (tuple): Width and height in device independent pixels.
+                Defaults to icon size used in stylesheets.
+            ratio (float): Device pixel ratio. Defaults to 1.0.
+
+        Returns:
+            QImage: rendered image.
+        """
+        key = (icon, state, tuple(size) if size else None, ratio)
+        with self.__lock:
+            image = self.__cache.get(key)
+            if image is not None:
+                self.__hits += 1
+                self.__cache.move_to_end(key)
+                return image
+            self.__misses += 1
+
+        data, default_size = self.__tinted_svg(icon, state)
+        width, height = size or default_size
+        image = render_svg(data, width, height, ratio)
+
+        with self.__lock:
+            self.__cache[key] = image
+            while len(self.__cache) > self.cache_size:
+                self.__cache.popitem(last=False)
+        return image
+
+    def pixmap(self, icon, state='', size=None, ratio=1.0) -> QPixmap:
+        """Return icon as pixmap, see image(). Must be called from GUI thread."""
+        return QPixmap.fromImage(self.image(icon, state, size, ratio))
+
+    def resources(self, ratios=None) -> dict:
+        """
+        Return png files of all icons named like files in style resources.
+
+        Args:
+            ratios (list(int)): High DPI variants to render (e.g. [2, 3]).
+                Defaults to variants required by connected screens.
+
+        Returns:
+            dict: Mapping of file paths (e.g. 'rc/arrow_down@2x.png') to png data.
+        """
+        if ratios is None:
+            ratios = _screen_ratios()
+
+        files = OrderedDict()
+        for icon, (_, _, has_states) in self.__icons.items():
+            for state in (ICON_STATES if has_states else ('',)):
+                files['rc/' + icon + state + '.png'] = image_to_png(self.image(icon, state))
+                for ratio in ratios:
+                    files['rc/{}{}@{}x.png'.format(icon, state, ratio)] = image_to_png(self.image(icon, state, ratio=ratio))
+        return files
+
+    def prepare(self, ratios=None) -> bytes:
+        """
+        Render all icons to resource data without registering it.
+
+        Can be called from any thread, ratios must be given then, as
+        connected screens are queried from GUI thread only.
+
+        Args:
+            ratios (list(int)): High DPI variants to render (e.g. [2, 3]).
+                Defaults to variants required by connected screens.
+
+        Returns:
+            bytes: binary resources data.
+        """
+        with self.__resource_lock:
+            if self.__resource_data is None:
+                self.__resource_data = create_rcc_data(self.resources(ratios))
+            return self.__resource_data
+
+    def register(self, ratios=None) -> str:
+        """
+        Register all icons as in-memory resources.
+
+        Args:
+            ratios (list(int)): High DPI variants to render (e.g. [2, 3]).
+                Defaults to variants required by connected screens.
+
+        Returns:
+            str: resource path which can be used as PATH_RESOURCES in stylesheets.
+        """
+        if not self.__registered:
+            # Qt does not copy registered data, reference must be kept
+            map_root = RUNTIME_RESOURCE_ROOT + '/' + self.__key
+            if not QResource.registerResourceData(self.prepare(ratios), map_root):
+                raise OSError("Failed to register icons of palette: {}".format(self.palette))
+            self.__registered = True
+            _logger.info("Registered runtime icons in: %s", self.resourcePath())
+        return self.resourcePath()
+
+    def unregister(self):
+        """Unregister icons registered with register()."""
+        if self.__registered:
+            QResource.unregisterResourceData(self.__resource_data, RUNTIME_RESOURCE_ROOT + '/' + self.__key)
+            self.__registered = False
+            self.__resource_data = None
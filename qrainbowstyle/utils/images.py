@@ -6,21 +6,24 @@ Utilities to process and convert svg images to png using palette colors.
 
 # Standard library imports
 
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
 import re
 import shutil
-import tempfile
+import time
 
 # Third party imports
-from qtpy.QtCore import QSize
-from qtpy.QtGui import QIcon
 from qtpy.QtWidgets import QApplication
 
 # Local imports
 from qrainbowstyle import (IMAGES_PATH, STYLES_SCSS_FILEPATH, QRC_FILEPATH, RC_PATH,
-                           SVG_PATH, BUTTONS_NT_PATH, BUTTONS_DARWIN_PATH)
+                           SVG_PATH, BUTTONS_NT_PATH, BUTTONS_DARWIN_PATH,
+                           SHARED_RC_PATH, SHARED_QRC_FILE)
 from qrainbowstyle.palette import BasePalette
+from qrainbowstyle.utils.icons import read_svg, render_svg
 
 IMAGE_BLACKLIST = ['base_palette']
 
@@ -39,6 +42,16 @@ TEMPLATE_QRC_FOOTER = '''
 </RCC>
 '''
 
+TEMPLATE_QRC_SHARED = '''
+<RCC warning="File created programmatically. All changes made in this file will be lost!">
+  <qresource prefix="{resource_prefix}">
+{files}
+  </qresource>
+</RCC>
+'''
+
+TEMPLATE_QRC_SHARED_FILE = '    <file>{fname}</file>'
+
 _logger = logging.getLogger(__name__)
 
 
@@ -47,7 +60,6 @@ def _create_nt_buttons(base_svg_path=BUTTONS_NT_PATH, rc_path=RC_PATH, palette=B
 
     sizes = [{"ext": '.png', "width": 45, "height": 30}, {"ext": '@2x.png', "width": 90, "height": 60}]
 
-    temp_dir = tempfile.mkdtemp()
     svg_fnames = [f for f in os.listdir(base_svg_path) if f.endswith('.svg')]
 
     background = palette.TITLE_BAR_BACKGROUND_COLOR
@@ -56,49 +68,40 @@ def _create_nt_buttons(base_svg_path=BUTTONS_NT_PATH, rc_path=RC_PATH, palette=B
     text = palette.TITLE_BAR_TEXT_COLOR
 
     for svg in svg_fnames:
-        svg_path = os.path.join(base_svg_path, svg)
-        with open(svg_path, 'r') as fh:
-            data = fh.read()
-
-            new_data = data
-            new_data = new_data.replace("TITLE_BAR_BUTTONS_DISABLED_COLOR", disabled)
-            new_data = new_data.replace("COLOR_BACKGROUND_DARK", background)
-            new_data = new_data.replace("COLOR_BACKGROUND_NORMAL", background_hover)
-            new_data = new_data.replace("COLOR_FOREGROUND_LIGHT", text)
+        data = read_svg(os.path.join(base_svg_path, svg))
 
-        temp_svg_path = os.path.join(temp_dir, svg)
-        with open(temp_svg_path, 'w') as fh:
-            fh.write(new_data)
+        new_data = data
+        new_data = new_data.replace("TITLE_BAR_BUTTONS_DISABLED_COLOR", disabled)
+        new_data = new_data.replace("COLOR_BACKGROUND_DARK", background)
+        new_data = new_data.replace("COLOR_BACKGROUND_NORMAL", background_hover)
+        new_data = new_data.replace("COLOR_FOREGROUND_LIGHT", text)
 
         for size in sizes:
             png_fname = svg.replace('.svg', size['ext'])
             png_path = os.path.join(rc_path, png_fname)
-            convert_svg_to_png(temp_svg_path, png_path, size['width'], size['height'])
+            render_svg(new_data, size['width'], size['height']).save(png_path)
 
 
 def _create_darwin_buttons(base_svg_path=BUTTONS_DARWIN_PATH, rc_path=RC_PATH):
     """Create png images from svg files for darwin style buttons"""
 
-    temp_dir = tempfile.mkdtemp()
     svg_fnames = [f for f in os.listdir(base_svg_path) if f.endswith('.svg')]
 
     sizes = [{"ext": '.png', "width": 32, "height": 32}, {"ext": '@2x.png', "width": 64, "height": 64}]
 
     for svg in svg_fnames:
-        svg_path = os.path.join(base_svg_path, svg)
-        temp_svg_path = os.path.join(temp_dir, svg)
-        shutil.copy2(svg_path, temp_svg_path)
+        data = read_svg(os.path.join(base_svg_path, svg))
 
         for size in sizes:
             png_fname = svg.replace('.svg', size['ext'])
             png_path = os.path.join(rc_path, png_fname)
-            convert_svg_to_png(temp_svg_path, png_path, size['height'], size['width'])
+            render_svg(data, size['width'], size['height']).save(png_path)
 
 
 def create_titlebar_images(buttons_svg_path=SVG_PATH, rc_path=RC_PATH, palette=BasePalette):
     """Create resources `rc` png image files from titlebar buttons svg files and palette
     """
-    _ = QApplication([])
+    _ = QApplication.instance() or QApplication([])
     _create_nt_buttons(rc_path=rc_path, palette=palette)
     _create_darwin_buttons(rc_path=rc_path)
 
@@ -123,29 +126,19 @@ def _get_file_color_map(fname, palette):
     return file_colors
 
 
-def _create_colored_svg(svg_path, temp_svg_path, color):
+def _create_colored_svg(svg_path, color):
     """
-    Replace base svg with fill color.
+    Return base svg contents with replaced fill color.
     """
-    with open(svg_path, 'r') as fh:
-        data = fh.read()
-
     base_color = '#ff0000'  # Hardcoded in base svg files
-    new_data = data.replace(base_color, color)
-
-    with open(temp_svg_path, 'w') as fh:
-        fh.write(new_data)
+    return read_svg(svg_path).replace(base_color, color)
 
 
 def convert_svg_to_png(svg_path, png_path, height, width):
     """
     Convert svg files to png files using Qt.
     """
-    size = QSize(height, width)
-    icon = QIcon(svg_path)
-    pixmap = icon.pixmap(size)
-    img = pixmap.toImage()
-    img.save(png_path)
+    render_svg(read_svg(svg_path), height, width).save(png_path)
 
 
 def create_palette_image(base_svg_path=SVG_PATH, path=IMAGES_PATH,
@@ -154,7 +147,7 @@ def create_palette_image(base_svg_path=SVG_PATH, path=IMAGES_PATH,
     Create palette image svg and png image on specified path.
     """
     # Needed to use QPixmap
-    _ = QApplication([])
+    _ = QApplication.instance() or QApplication([])
 
     base_palette_svg_path = os.path.join(base_svg_path, 'base_palette.svg')
     palette_svg_path = os.path.join(path, 'palette.svg')
@@ -176,31 +169,24 @@ def create_palette_image(base_svg_path=SVG_PATH, path=IMAGES_PATH,
     with open(palette_svg_path, 'w+') as fh:
         fh.write(data)
 
-    convert_svg_to_png(palette_svg_path, palette_png_path, 4000, 4000)
+    render_svg(data, 4000, 4000).save(palette_png_path)
 
     return palette_svg_path, palette_png_path
 
 
-def create_images(base_svg_path=SVG_PATH, rc_path=RC_PATH,
-                  palette=BasePalette):
-    """Create resources `rc` png image files from base svg files and palette.
-
-    Search all SVG files in `base_svg_path` excluding IMAGE_BLACKLIST,
-    change its colors using `palette` creating temporary SVG files, for each
-    state generating PNG images for each size `heights`.
+def get_image_work_items(base_svg_path=SVG_PATH, rc_path=RC_PATH,
+                         palette=BasePalette):
+    """Return png images to create from base svg files and palette.
 
     Args:
         base_svg_path (str, optional): Input svgs directory path. Defaults to SVG_PATH.
         rc_path (str, optional): Output pngs directory path. Defaults to RC_PATH.
         palette (BasePalette, optional): Palette . Defaults to BasePalette.
-    """
-
-    # Needed to use QPixmap
-    _ = QApplication([])
 
-    temp_dir = tempfile.mkdtemp()
+    Returns:
+        list(tuple): work items (svg_path, color, png_path, height, width).
+    """
     svg_fnames = [f for f in os.listdir(base_svg_path) if f.endswith('.svg')]
-    base_height = 32
 
     # See: https://doc.qt.io/qt-5/scalability.html
     heights = {
@@ -208,24 +194,9 @@ def create_images(base_svg_path=SVG_PATH, rc_path=RC_PATH,
         64: '@2x.png',
     }
 
-    _logger.info("Creating images ...")
-    _logger.info("SVG folder: %s", base_svg_path)
-    _logger.info("TMP folder: %s", temp_dir)
-    _logger.info("PNG folder: %s", rc_path)
-
-    num_svg = len(svg_fnames)
-    num_png = 0
-    num_ignored = 0
-
-    # Get rc links from scss to check matches
-    rc_list = get_rc_links_from_scss()
-    num_rc_list = len(rc_list)
-
+    items = []
     for height, ext in heights.items():
         width = height
-
-        _logger.debug(" Size HxW (px): {} X {}".format(height, width))
-
         for svg_fname in svg_fnames:
             svg_name = svg_fname.split('.')[0]
 
@@ -234,35 +205,110 @@ def create_images(base_svg_path=SVG_PATH, rc_path=RC_PATH,
                 svg_path = os.path.join(base_svg_path, svg_fname)
                 color_files = _get_file_color_map(svg_fname, palette=palette)
 
-                _logger.debug("  Working on: %s"
-                              % os.path.basename(svg_fname))
-
                 # Replace colors and create all file for different states
                 for color_svg_name, color in color_files.items():
-                    temp_svg_path = os.path.join(temp_dir, color_svg_name)
-                    _create_colored_svg(svg_path, temp_svg_path, color)
-
                     png_fname = color_svg_name.replace('.svg', ext)
                     png_path = os.path.join(rc_path, png_fname)
-                    convert_svg_to_png(temp_svg_path, png_path, height, width)
-                    num_png += 1
-                    _logger.debug("   Creating: %s"
-                                  % os.path.basename(png_fname))
-
-                    # Check if the rc_name is in the rc_list from scss
-                    # only for the base size
-                    if height == base_height:
-                        rc_base = os.path.basename(rc_path)
-                        png_base = os.path.basename(png_fname)
-                        rc_name = '/' + os.path.join(rc_base, png_base)
-                        try:
-                            rc_list.remove(rc_name)
-                        except ValueError:
-                            pass
-            else:
-                num_ignored += 1
-                _logger.debug("  Ignored blacklist: %s"
-                              % os.path.basename(svg_fname))
+                    items.append((svg_path, color, png_path, height, width))
+
+    return items
+
+
+# Per process state of image rendering workers
+_worker = {"app": None}
+
+
+def _init_image_worker():
+    """Create offscreen QGuiApplication for worker process."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from qtpy.QtGui import QGuiApplication
+    _worker["app"] = QGuiApplication.instance() or QGuiApplication([])
+
+
+def _render_image_work_item(item):
+    """Create one png image."""
+    svg_path, color, png_path, height, width = item
+    render_svg(_create_colored_svg(svg_path, color), height, width).save(png_path)
+    return png_path
+
+
+def render_images(items, jobs=1):
+    """Create png images from work items.
+
+    Args:
+        items (list(tuple)): work items from get_image_work_items().
+        jobs (int, optional): Number of worker processes. Every worker
+            creates its own offscreen QGuiApplication. Defaults to 1,
+            which renders images in current process.
+
+    Returns:
+        int: number of created images.
+    """
+    start = time.perf_counter()
+
+    if jobs > 1:
+        # spawn, Qt does not survive fork
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(jobs, initializer=_init_image_worker) as pool:
+            chunksize = max(1, len(items) // (jobs * 8))
+            for png_path in pool.imap_unordered(_render_image_work_item, items, chunksize=chunksize):
+                _logger.debug("   Created: %s", os.path.basename(png_path))
+    else:
+        # Needed to use QPainter
+        _ = QApplication.instance() or QApplication([])
+
+        for item in items:
+            png_path = _render_image_work_item(item)
+            _logger.debug("   Created: %s", os.path.basename(png_path))
+
+    elapsed = time.perf_counter() - start
+    _logger.info("Rendered %s PNG files with %s job(s) in %.2f s (%.1f ms per file)",
+                 len(items), max(jobs, 1), elapsed, 1000 * elapsed / max(len(items), 1))
+
+    return len(items)
+
+
+def create_images(base_svg_path=SVG_PATH, rc_path=RC_PATH,
+                  palette=BasePalette, jobs=1):
+    """Create resources `rc` png image files from base svg files and palette.
+
+    Search all SVG files in `base_svg_path` excluding IMAGE_BLACKLIST,
+    change its colors using `palette` in memory, for each
+    state generating PNG images for each size `heights`.
+
+    Args:
+        base_svg_path (str, optional): Input svgs directory path. Defaults to SVG_PATH.
+        rc_path (str, optional): Output pngs directory path. Defaults to RC_PATH.
+        palette (BasePalette, optional): Palette . Defaults to BasePalette.
+        jobs (int, optional): Number of worker processes. Defaults to 1.
+    """
+    svg_fnames = [f for f in os.listdir(base_svg_path) if f.endswith('.svg')]
+    base_height = 32
+
+    _logger.info("Creating images ...")
+    _logger.info("SVG folder: %s", base_svg_path)
+    _logger.info("PNG folder: %s", rc_path)
+
+    num_svg = len(svg_fnames)
+    num_ignored = len([f for f in svg_fnames if f.split('.')[0] in IMAGE_BLACKLIST])
+
+    items = get_image_work_items(base_svg_path=base_svg_path, rc_path=rc_path, palette=palette)
+    num_png = render_images(items, jobs=jobs)
+
+    # Get rc links from scss to check matches
+    rc_list = get_rc_links_from_scss()
+    num_rc_list = len(rc_list)
+
+    # Check if the rc_name is in the rc_list from scss
+    # only for the base size
+    rc_base = os.path.basename(rc_path)
+    for _, _, png_path, height, _ in items:
+        if height == base_height:
+            rc_name = '/' + os.path.join(rc_base, os.path.basename(png_path))
+            try:
+                rc_list.remove(rc_name)
+            except ValueError:
+                pass
 
     _logger.info("# SVG files: %s", num_svg)
     _logger.info("# SVG ignored: %s", num_ignored)
@@ -341,3 +387,106 @@ def get_rc_links_from_scss(pattern=r"\/.*\.png"):
     rc_list = list(set(rc_list))
 
     return rc_list
+
+
+def create_shared_images(rc_path, manifest_path, shared_rc_path=SHARED_RC_PATH):
+    """
+    Move style png images to content-addressed shared resources folder.
+
+    Every image is stored together with its high DPI variants (e.g. @2x)
+    under a name made of the hash of all variants, so identical images
+    of different styles are stored only once. Mapping of style resource
+    paths to shared names is saved in manifest file.
+
+    Args:
+        rc_path (str): Folder with png images of the style.
+        manifest_path (str): Output path of manifest file.
+        shared_rc_path (str, optional): Shared resources folder.
+            Defaults to 'SHARED_RC_PATH'.
+
+    Returns:
+        dict: mapping of style resource paths to shared file names.
+    """
+    os.makedirs(shared_rc_path, exist_ok=True)
+
+    rc_base = os.path.basename(rc_path)
+    fnames = sorted(f for f in os.listdir(rc_path) if f.endswith('.png'))
+    manifest = {}
+    num_stored = 0
+
+    _logger.info("Creating shared images ...")
+    _logger.info("PNG folder: %s", rc_path)
+    _logger.info("Shared folder: %s", shared_rc_path)
+
+    for fname in fnames:
+        name = fname[:-len('.png')]
+        if '@' in name:
+            # high DPI variants are stored with their base image
+            continue
+
+        variants = [f[len(name):] for f in fnames if f == fname or f.startswith(name + '@')]
+
+        digest = hashlib.sha1()
+        for variant in variants:
+            digest.update(variant.encode())
+            with open(os.path.join(rc_path, name + variant), 'rb') as fh:
+                digest.update(fh.read())
+        shared_name = digest.hexdigest()[:20]
+
+        for variant in variants:
+            shared_filepath = os.path.join(shared_rc_path, shared_name + variant)
+            if not os.path.isfile(shared_filepath):
+                shutil.copyfile(os.path.join(rc_path, name + variant), shared_filepath)
+                num_stored += 1
+
+        manifest[rc_base + '/' + fname] = shared_name + '.png'
+
+    with open(manifest_path, 'w') as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+
+    _logger.info("# PNG files: %s", len(fnames))
+    _logger.info("# PNG files stored: %s", num_stored)
+
+    return manifest
+
+
+def prune_shared_images(manifests, shared_rc_path=SHARED_RC_PATH):
+    """
+    Remove shared images which are not used by any manifest.
+
+    Args:
+        manifests (list(dict)): Manifests of all styles.
+        shared_rc_path (str, optional): Shared resources folder.
+            Defaults to 'SHARED_RC_PATH'.
+    """
+    used = set(os.path.splitext(name)[0] for manifest in manifests for name in manifest.values())
+
+    for fname in os.listdir(shared_rc_path):
+        if fname.endswith('.png') and fname.split('@')[0].split('.')[0] not in used:
+            os.remove(os.path.join(shared_rc_path, fname))
+            _logger.debug("Removed unused shared image: %s", fname)
+
+
+def generate_shared_qrc_file(resource_prefix='qss_shared', shared_rc_path=SHARED_RC_PATH,
+                             qrc_path=None):
+    """
+    Generate the QRC file of shared images.
+
+    Args:
+        resource_prefix (str, optional): Prefix used in resources.
+            Defaults to 'qss_shared'.
+        shared_rc_path (str, optional): Shared resources folder.
+            Defaults to 'SHARED_RC_PATH'.
+        qrc_path (str, optional): Output path.
+            Defaults to 'SHARED_QRC_FILE' in shared resources folder.
+    """
+    if qrc_path is None:
+        qrc_path = os.path.join(shared_rc_path, SHARED_QRC_FILE)
+
+    files = [TEMPLATE_QRC_SHARED_FILE.format(fname=fname)
+             for fname in sorted(os.listdir(shared_rc_path)) if fname.endswith('.png')]
+
+    _logger.info("Writing in: %s", qrc_path)
+
+    with open(qrc_path, 'w') as fh:
+        fh.write(TEMPLATE_QRC_SHARED.format(resource_prefix=resource_prefix, files='\n'.join(files)))
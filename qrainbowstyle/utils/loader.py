@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Loading of stylesheets in background.
+
+Stylesheet is prepared on worker thread: style is looked up, stylesheet is
+read and patched and icons of runtime palettes are rendered. Only
+registration of resources and QApplication.setStyleSheet run on GUI
+thread, prepared request is delivered there with queued signal.
+
+One worker thread prepares stylesheets in order of requests, so
+prefetched styles do not compete for GIL with each other.
+"""
+
+# Standard library imports
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Third party imports
+from qtpy.QtCore import QCoreApplication, QObject, Signal
+
+# Local imports
+import qrainbowstyle
+from qrainbowstyle.utils.icons import _screen_ratios
+from qrainbowstyle.utils.switcher import StyleSwitcher
+
+_logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+# Executor of worker thread and loader used by load_stylesheet_async
+_instances = {"executor": None, "loader": None}
+
+
+def get_executor():
+    """Return executor of worker thread preparing stylesheets."""
+    with _lock:
+        if _instances["executor"] is None:
+            _instances["executor"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix='qrainbowstyle')
+        return _instances["executor"]
+
+
+def _theme_args(theme):
+    """Return style and palette arguments of style name or palette."""
+    if isinstance(theme, str):
+        return theme, None
+    return '', theme
+
+
+class StylesheetLoader(QObject):
+    """Load stylesheets in background and apply them on GUI thread.
+
+    Loader must be created on GUI thread.
+
+    Signals:
+        loaded (str): Stylesheet was loaded and applied if requested.
+        failed (object): Exception raised while loading stylesheet.
+
+    Args:
+        parent (QObject): Parent object.
+    """
+
+    loaded = Signal(str)
+    failed = Signal(object)
+
+    # emitted from worker thread, slot runs on thread of loader
+    _prepared = Signal(object)
+
+    def __init__(self, parent=None):
+        super(StylesheetLoader, self).__init__(parent)
+        self._prepared.connect(self.__finish)
+
+    def prepare(self, style='', palette=None) -> Future:
+        """
+        Prepare stylesheet on worker thread without loading it.
+
+        Args:
+            style (str): Style name, not case sensitive.
+            palette (BasePalette or dict): Runtime palette, if given style
+                is ignored.
+
+        Returns:
+            Future: resolved on worker thread when stylesheet is prepared.
+        """
+        # screens are queried here, on GUI thread
+        return get_executor().submit(qrainbowstyle._prepare_stylesheet, style, palette, _screen_ratios())
+
+    def prefetch(self, themes) -> list:
+        """
+        Prepare stylesheets of themes ahead of time.
+
+        Args:
+            themes (list): Style names or palettes.
+
+        Returns:
+            list(Future): futures of prepare() for every theme.
+        """
+        return [self.prepare(*_theme_args(theme)) for theme in themes]
+
+    def load(self, qt_api='', style='qdarkstyle3', palette=None, apply=True) -> Future:
+        """
+        Load stylesheet, it is prepared on worker thread and loaded on GUI thread.
+
+        Args:
+            qt_api (str): Qt binding name, see load_stylesheet().
+            style (str): Style name, not case sensitive.
+            palette (BasePalette or dict): Runtime palette, if given style
+                is ignored.
+            apply (bool): Set loaded stylesheet on QApplication.
+
+        Returns:
+            Future: resolved on GUI thread with stylesheet string.
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        request = (future, qt_api, style, palette, apply)
+        prepared = self.prepare(style, palette)
+        prepared.add_done_callback(lambda result: self._prepared.emit(request + (result,)))
+        return future
+
+    def __finish(self, request):
+        future, qt_api, style, palette, apply, prepared = request
+        try:
+            prepared.result()
+            # stylesheet is in cache, only resources are registered
+            stylesheet = qrainbowstyle.load_stylesheet(qt_api=qt_api, style=style, palette=palette)
+            if apply:
+                StyleSwitcher(QCoreApplication.instance()).apply(stylesheet)
+        except Exception as error:
+            _logger.exception("Failed to load stylesheet")
+            future.set_exception(error)
+            self.failed.emit(error)
+            return
+
+        future.set_result(stylesheet)
+        self.loaded.emit(stylesheet)
+
+
+def get_stylesheet_loader():
+    """Return loader used by load_stylesheet_async, created on first call from GUI thread."""
+    with _lock:
+        if _instances["loader"] is None:
+            app = QCoreApplication.instance()
+            if app is None:
+                raise RuntimeError("QApplication must be created before stylesheets are loaded in background")
+            _instances["loader"] = StylesheetLoader(app)
+        return _instances["loader"]
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Replacement of palette variable names with their values.
+
+Names are matched with one compiled regular expression, longest names
+first, so text is scanned once and values containing other names
+(e.g. BORDER_1 = '1px solid $COLOR_BACKGROUND_1') are already resolved.
+"""
+
+# Standard library imports
+import functools
+import re
+
+# Local imports
+from qrainbowstyle.utils.template import resolve_variables
+
+RAINBOWIZER_CACHE_SIZE = 16
+
+# Joins batch of texts, never part of a variable name
+_BATCH_SEPARATOR = '\0'
+
+
+class Rainbowizer:
+    """Replace palette variable names in texts with palette values.
+
+    Args:
+        palette (BasePalette or dict): Palette class or dictionary of
+            variable names to values.
+    """
+
+    def __init__(self, palette):
+        super(Rainbowizer, self).__init__()
+        self.palette = palette
+        self.values = resolve_variables(palette)
+        self.__separatorInValues = any(_BATCH_SEPARATOR in str(value) for value in self.values.values())
+
+        names = sorted(self.values, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(name) for name in names)) if names else None
+
+    def __replace(self, match):
+        return self.values[match.group(0)]
+
+    def sub(self, text: str) -> str:
+        """Return text with variable names replaced with values."""
+        if self.pattern is None:
+            return text
+        return self.pattern.sub(self.__replace, text)
+
+    def subAll(self, texts) -> list:
+        """Return list of texts with variable names replaced with values, texts are scanned at once.
+
+        Texts containing batch separator are replaced one by one, so result
+        is always aligned with texts.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        if self.__separatorInValues or any(_BATCH_SEPARATOR in text for text in texts):
+            return [self.sub(text) for text in texts]
+        return self.sub(_BATCH_SEPARATOR.join(texts)).split(_BATCH_SEPARATOR)
+
+
+@functools.lru_cache(maxsize=RAINBOWIZER_CACHE_SIZE)
+def get_rainbowizer(palette):
+    """Return rainbowizer of palette class, it is created once per palette."""
+    return Rainbowizer(palette)
@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Utilities for registering compiled style resources.
+
+Binary ``style.rcc`` files are preferred, Qt memory-maps them on registration.
+Source tree has only ``style_rc`` modules, ``setup.py`` converts them to
+binary files when package is built. When style has no binary resources, its
+``style_rc`` module is imported from package path with importlib, so loading
+a style does not change the working directory or ``sys.path``.
+
+Only one style is registered in Qt resource system at a time. Registry keeps
+track of it, so switching styles unregisters exactly one resource blob.
+
+Styles generated with shared resources have a manifest file which maps their
+icons to content-addressed images stored once for all styles. The shared
+resources are registered once and icon urls in stylesheet are rewritten
+using the manifest.
+"""
+
+# Standard library imports
+import ast
+import importlib
+import json
+import logging
+import os
+import re
+import struct
+import sys
+import threading
+
+# Local imports
+from qrainbowstyle import QSS_FILE, RC_MANIFEST_FILE, RCC_FILE, SHARED_RC_PATH, SHARED_RCC_FILE, STYLES_PATH
+
+_logger = logging.getLogger(__name__)
+
+RESOURCE_MODULE = 'style_rc'
+
+RESOURCE_PREFIX = 'qss_icons'
+SHARED_RESOURCE_PREFIX = 'qss_shared'
+
+# Root under which style.rcc is mapped while its stylesheet is read by read_style_qss
+READ_RESOURCE_ROOT = 'qrainbowstyle_read'
+
+_url_pattern = re.compile(r':/' + RESOURCE_PREFIX + r'/([^"\')\s]+)')
+
+_lock = threading.RLock()
+
+# Currently registered style, its palette, manifest and function unregistering its resources
+_registered = {"style": None, "palette": None, "manifest": None, "unregister": None}
+
+# Shared resources stay registered once loaded, they are used by all styles
+_shared = {"registered": False}
+
+
+def _resource_module_name(style):
+    """Return absolute module name of style resources."""
+    return "qrainbowstyle.styles.{}.{}".format(style, RESOURCE_MODULE)
+
+
+def get_registered_style():
+    """Return name of style which resources are currently registered or None."""
+    return _registered["style"]
+
+
+def unregister_style_resources():
+    """Unregister resources of currently registered style."""
+    with _lock:
+        if _registered["unregister"] is not None:
+            _registered["unregister"]()
+            _logger.debug("Unregistered resources of style: %s", _registered["style"])
+        _registered["style"] = None
+        _registered["palette"] = None
+        _registered["manifest"] = None
+        _registered["unregister"] = None
+
+
+def _register_rcc(style, rcc_filepath, palette=None):
+    """Register binary resources file and return palette and unregister function."""
+    from qtpy.QtCore import QResource
+    from qrainbowstyle.registry import find_palette
+
+    palette = palette or find_palette(style)
+    if palette is None:
+        raise ModuleNotFoundError("Palette of style {} is not registered".format(style))
+
+    if not QResource.registerResource(rcc_filepath):
+        raise OSError("Failed to register resources file: {}".format(rcc_filepath))
+
+    return palette, lambda: QResource.unregisterResource(rcc_filepath)
+
+
+def read_style_qss(style):
+    """
+    Return stylesheet of style without registering its resources, can be called from any thread.
+
+    Loose style.qss is read if it exists, otherwise stylesheet is read from
+    style.rcc, or from resources of style_rc module parsed without importing
+    it, mapped under its own root for the time of reading, so resources of
+    style in use are not affected.
+
+    Returns:
+        str: stylesheet or None if style has no stylesheet file nor resources.
+    """
+    qss_filepath = os.path.join(STYLES_PATH, style, QSS_FILE)
+    if os.path.isfile(qss_filepath):
+        with open(qss_filepath, 'r', encoding='utf-8') as fh:
+            return fh.read()
+
+    from qtpy.QtCore import QFile, QResource
+
+    root = '/{}/{}'.format(READ_RESOURCE_ROOT, style)
+    rcc_filepath = os.path.join(STYLES_PATH, style, RCC_FILE)
+    module_filepath = os.path.join(STYLES_PATH, style, RESOURCE_MODULE + '.py')
+    if os.path.isfile(rcc_filepath):
+        register, unregister, source = QResource.registerResource, QResource.unregisterResource, rcc_filepath
+    elif os.path.isfile(module_filepath):
+        # Qt does not copy registered data, it is kept referenced until unregistered
+        register, unregister = QResource.registerResourceData, QResource.unregisterResourceData
+        source = _module_rcc_data(module_filepath)
+    else:
+        return None
+
+    if not register(source, root):
+        _logger.warning("Failed to map resources of style: %s", style)
+        return None
+    try:
+        qss_file = QFile(':{}/qrainbowstyle/{}'.format(root, QSS_FILE))
+        if not qss_file.open(QFile.ReadOnly):
+            return None
+        try:
+            return bytes(qss_file.readAll()).decode('utf-8').replace('\r\n', '\n')
+        finally:
+            qss_file.close()
+    finally:
+        unregister(source, root)
+
+
+def _read_manifest(style):
+    """Return shared resources manifest of style or None."""
+    manifest_filepath = os.path.join(STYLES_PATH, style, RC_MANIFEST_FILE)
+    if not os.path.isfile(manifest_filepath):
+        return None
+
+    with open(manifest_filepath, 'r') as fh:
+        return json.load(fh)
+
+
+def _register_shared_resources():
+    """Register shared images once."""
+    from qtpy.QtCore import QResource
+
+    if _shared["registered"]:
+        return
+
+    shared_rcc_filepath = os.path.join(SHARED_RC_PATH, SHARED_RCC_FILE)
+    if not QResource.registerResource(shared_rcc_filepath):
+        raise OSError("Failed to register shared resources file: {}".format(shared_rcc_filepath))
+
+    _shared["registered"] = True
+    _logger.info("Registered shared resources")
+
+
+def map_shared_resources(stylesheet, style=None):
+    """Rewrite icon urls of style to shared resources.
+
+    Stylesheet is returned unchanged if style does not use shared
+    resources.
+
+    Args:
+        stylesheet (str): Stylesheet of style.
+        style (str): Style directory name, case sensitive. Defaults to
+            registered style.
+
+    Returns:
+        str: stylesheet string (css).
+    """
+    manifest = _registered["manifest"] if style is None else _read_manifest(style)
+    if not manifest:
+        return stylesheet
+
+    def replace(match):
+        shared_name = manifest.get(match.group(1))
+        if shared_name is None:
+            return match.group(0)
+        return ':/' + SHARED_RESOURCE_PREFIX + '/' + shared_name
+
+    return _url_pattern.sub(replace, stylesheet)
+
+
+def _register_module(style):
+    """Register resources from style_rc module and return palette and unregister function."""
+    module_name = _resource_module_name(style)
+    module = sys.modules.get(module_name)
+    if module is None:
+        try:
+            # resources are registered on import
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError("Failed to import {} of style: {}".format(RESOURCE_MODULE, style))
+    else:
+        module.qInitResources()
+
+    return module.palette, module.qCleanupResources
+
+
+def register_style_resources(style, palette=None):
+    """Register resources of style and return its palette.
+
+    Resources of previously registered style are unregistered first.
+    Binary resources file is used if style has one, otherwise resource
+    module is imported once and later registered again from the already
+    imported module.
+
+    Args:
+        style (str): Style directory name, case sensitive.
+        palette (BasePalette): Palette of style, e.g. restored from
+            snapshot. Looked up in registry if not given.
+
+    Returns:
+        BasePalette: palette used to generate style.
+    """
+    with _lock:
+        if _registered["style"] == style:
+            _logger.debug("Style resources already registered: %s", style)
+            return _registered["palette"]
+
+        unregister_style_resources()
+
+        manifest = _read_manifest(style)
+        if manifest is not None:
+            _register_shared_resources()
+
+        rcc_filepath = os.path.join(STYLES_PATH, style, RCC_FILE)
+        if os.path.isfile(rcc_filepath):
+            palette, unregister = _register_rcc(style, rcc_filepath, palette)
+        else:
+            module_palette, unregister = _register_module(style)
+            palette = palette or module_palette
+
+        _registered["style"] = style
+        _registered["palette"] = palette
+        _registered["manifest"] = manifest
+        _registered["unregister"] = unregister
+        _logger.info("Registered resources of style: %s", style)
+
+        return palette
+
+
+def _read_resource_module(module_filepath):
+    """Read resource arrays from compiled resource module without executing it."""
+    with open(module_filepath, 'r') as fh:
+        tree = ast.parse(fh.read())
+
+    arrays = {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign)
+                and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id.startswith('qt_resource_')):
+            arrays[node.targets[0].id] = ast.literal_eval(node.value)
+
+    return arrays
+
+
+def _qt_hash(name):
+    """Return hash of resource name as computed by Qt."""
+    encoded = name.encode('utf-16-be')
+    h = 0
+    for unit in struct.unpack('>{}H'.format(len(encoded) // 2), encoded):
+        h = (h << 4) + unit
+        h ^= (h & 0xf0000000) >> 23
+        h &= 0x0fffffff
+    return h
+
+
+def create_rcc_data(files):
+    """Create binary resources data from files in memory.
+
+    Data has the same layout as produced by ``rcc -binary`` (format
+    version 1, uncompressed), so it can be registered with
+    ``QResource.registerResourceData``. Registered data is not copied
+    by Qt, caller must keep a reference to it while it is registered.
+
+    Args:
+        files (dict): Mapping of resource paths (e.g. 'qss_icons/rc/x.png')
+            to file contents.
+
+    Returns:
+        bytes: binary resources data.
+    """
+    # build directory tree
+    root = {}
+    for path, content in files.items():
+        node = root
+        parts = [part for part in path.split('/') if part]
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = content
+
+    names = bytearray()
+    name_offsets = {}
+    data = bytearray()
+
+    def name_offset(name):
+        if name not in name_offsets:
+            encoded = name.encode('utf-16-be')
+            name_offsets[name] = len(names)
+            names.extend(struct.pack('>HI', len(encoded) // 2, _qt_hash(name)) + encoded)
+        return name_offsets[name]
+
+    # nodes are stored breadth first, children of directory are sorted by name hash
+    nodes = [('', root)]
+    first_child = {}
+    index = 0
+    while index < len(nodes):
+        node = nodes[index][1]
+        if isinstance(node, dict):
+            first_child[index] = len(nodes)
+            nodes.extend((name, node[name]) for name in sorted(node, key=_qt_hash))
+        index += 1
+
+    tree = bytearray()
+    for index, (name, node) in enumerate(nodes):
+        offset = name_offset(name) if index else 0
+        if isinstance(node, dict):
+            tree.extend(struct.pack('>IHII', offset, 0x02, len(node), first_child[index]))
+        else:
+            # flags, any country, C language
+            tree.extend(struct.pack('>IHHHI', offset, 0, 0, 1, len(data)))
+            data.extend(struct.pack('>I', len(node)) + node)
+
+    header_size = 4 + 4 * 4
+    data_offset = header_size
+    names_offset = data_offset + len(data)
+    tree_offset = names_offset + len(names)
+    header = b'qres' + struct.pack('>iiii', 1, tree_offset, data_offset, names_offset)
+
+    return bytes(header + data + names + tree)
+
+
+def _module_rcc_data(module_filepath):
+    """Return binary resources data of compiled resource module, module is not executed."""
+    arrays = _read_resource_module(module_filepath)
+
+    if 'qt_resource_struct_v2' in arrays:
+        version, tree = 2, arrays['qt_resource_struct_v2']
+    else:
+        version, tree = 1, arrays.get('qt_resource_struct_v1', arrays.get('qt_resource_struct'))
+
+    data = arrays['qt_resource_data']
+    names = arrays['qt_resource_name']
+
+    # magic, version, tree offset, data offset, names offset
+    header_size = 4 + 4 * 4
+    data_offset = header_size
+    names_offset = data_offset + len(data)
+    tree_offset = names_offset + len(names)
+    header = b'qres' + struct.pack('>iiii', version, tree_offset, data_offset, names_offset)
+
+    return header + data + names + tree
+
+
+def create_rcc_file(module_filepath, rcc_filepath):
+    """Create binary resources file from compiled resource module.
+
+    Used when rcc tool is not available and when package is built.
+    Output has the same layout as produced by ``rcc -binary``.
+
+    Args:
+        module_filepath (str): Path to resource module created by pyrcc5,
+            pyside2-rcc or pyside6-rcc.
+        rcc_filepath (str): Output path.
+    """
+    with open(rcc_filepath, 'wb') as fh:
+        fh.write(_module_rcc_data(module_filepath))
+
+    _logger.info("Created binary resources file: %s", rcc_filepath)
@@ -3,22 +3,27 @@
 """Utilities for compiling SASS files."""
 
 # Standard library imports
+import hashlib
+import json
 import keyword
 import logging
 import os
 import re
 import shutil
 import sys
+import threading
+from collections import OrderedDict
 
 # Third party imports
 import qtsass
 
 # Local imports
 from qrainbowstyle import (MAIN_SCSS_FILE, MAIN_SCSS_FILEPATH, QSS_PATH,
-                           QSS_FILEPATH, RC_PATH, QSS_FILE,
-                           VARIABLES_SCSS_FILE, VARIABLES_SCSS_FILEPATH)
+                           QSS_FILEPATH, RC_PATH, QSS_FILE, STYLES_SCSS_FILEPATH,
+                           QSS_TEMPLATE_FILEPATH, VARIABLES_SCSS_FILE, VARIABLES_SCSS_FILEPATH)
 from qrainbowstyle.palette import BasePalette
 from qrainbowstyle.utils.images import create_images, create_palette_image
+from qrainbowstyle.utils.template import TOKEN_PREFIX, QssTemplate, _unquote, render_qss
 
 # Constants
 PY2 = sys.version[0] == '2'
@@ -45,8 +50,19 @@ HEADER_QSS = '''/* -------------------------------------------------------------
 --------------------------------------------------------------------------- */
 '''
 
+QSS_CACHE_SIZE = 32
+
 _logger = logging.getLogger(__name__)
 
+_import_pattern = re.compile(r"""^@import\s+['"]_?(variables|styles)['"];[ \t]*$""", re.M)
+
+# Shared SCSS sources, read again only when files change
+_sources = {"stat": None, "main": None, "styles": None, "hash": None}
+
+# Compiled stylesheets keyed by hash of palette, sources and qtsass version
+_qss_cache = OrderedDict()
+_qss_lock = threading.Lock()
+
 
 def _dict_to_scss(data):
     """Create a scss variables string from a dict."""
@@ -106,12 +122,147 @@ def _create_qss(main_scss_path, qss_filepath, header=HEADER_QSS):
     return data
 
 
+def _read_scss_sources():
+    """Return shared SCSS sources and their hash, files are read again only if changed."""
+    stat = tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size)
+                 for path in (MAIN_SCSS_FILEPATH, STYLES_SCSS_FILEPATH))
+    with _qss_lock:
+        if _sources["stat"] != stat:
+            with open(MAIN_SCSS_FILEPATH, 'r') as fh:
+                _sources["main"] = fh.read()
+            with open(STYLES_SCSS_FILEPATH, 'r') as fh:
+                _sources["styles"] = fh.read()
+            _sources["hash"] = hashlib.sha1((_sources["main"] + _sources["styles"]).encode()).hexdigest()
+            _sources["stat"] = stat
+        return _sources["main"], _sources["styles"], _sources["hash"]
+
+
+def get_qss_cache_key(palette):
+    """Return hash of palette variables, SCSS sources and qtsass version."""
+    sources_hash = _read_scss_sources()[2]
+    data = json.dumps([palette.to_dict(), sources_hash, qtsass.__version__])
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def clear_qss_cache():
+    """Remove all compiled stylesheets from memory cache."""
+    with _qss_lock:
+        _qss_cache.clear()
+
+
+def compile_qss_string(palette=BasePalette, cache_dir=None, header=HEADER_QSS):
+    """
+    Compile stylesheet of palette without temporary files.
+
+    Variables and shared styles are inlined into main SCSS source, so
+    nothing is written next to the sources. Compiled stylesheets are kept
+    in memory cache and optionally in cache directory.
+
+    Args:
+        palette (BasePalette): Palette class.
+        cache_dir (str): Directory with compiled stylesheets. Defaults to
+            None, which uses only memory cache.
+        header (str): Header of stylesheet, formatted with qtsass version.
+
+    Returns:
+        str: stylesheet string (css).
+    """
+    main, styles, _ = _read_scss_sources()
+    key = get_qss_cache_key(palette)
+
+    with _qss_lock:
+        data = _qss_cache.get(key)
+        if data is not None:
+            _qss_cache.move_to_end(key)
+            return header.format(qtsass.__version__) + data
+
+    cache_filepath = os.path.join(cache_dir, key + '.qss') if cache_dir else None
+    if cache_filepath and os.path.isfile(cache_filepath):
+        with open(cache_filepath, 'r') as fh:
+            data = fh.read()
+        _logger.debug("Loaded compiled stylesheet from: %s", cache_filepath)
+    else:
+        sources = {"variables": _dict_to_scss(palette.to_dict()) + '\n', "styles": styles}
+        data = qtsass.compile(_import_pattern.sub(lambda match: sources[match.group(1)], main),
+                              output_style='expanded')
+        if cache_filepath:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_filepath, 'w') as fh:
+                fh.write(data)
+
+    with _qss_lock:
+        _qss_cache[key] = data
+        while len(_qss_cache) > QSS_CACHE_SIZE:
+            _qss_cache.popitem(last=False)
+
+    return header.format(qtsass.__version__) + data
+
+
+def compile_qss_template(header=HEADER_QSS):
+    """
+    Compile shared SCSS sources to stylesheet template.
+
+    Every palette variable is replaced with placeholder token before
+    compilation, tokens are then removed and their offsets stored.
+
+    Args:
+        header (str): Header of stylesheet, formatted with qtsass version.
+
+    Returns:
+        QssTemplate: template which renders stylesheets of any palette.
+    """
+    main, styles, sources_hash = _read_scss_sources()
+
+    defined = set(re.findall(r'^\s*\$([A-Za-z_][A-Za-z0-9_]*)\s*:', main + styles, re.M))
+    names = sorted(set(re.findall(r'\$([A-Za-z_][A-Za-z0-9_]*)', main + styles)) - defined)
+
+    variables = OrderedDict()
+    for name in names:
+        token = TOKEN_PREFIX + name
+        # strings must stay strings, they are concatenated in sources
+        default = str(getattr(BasePalette, name, ''))
+        variables[name] = "'{}'".format(token) if _unquote(default) != default else token
+
+    sources = {"variables": _dict_to_scss(variables) + '\n', "styles": styles}
+    stylesheet = qtsass.compile(_import_pattern.sub(lambda match: sources[match.group(1)], main),
+                                output_style='expanded')
+
+    return QssTemplate.fromTokens(stylesheet, header.format(qtsass.__version__), sources_hash)
+
+
+def create_qss_template(template_filepath=QSS_TEMPLATE_FILEPATH, force=False):
+    """Compile stylesheet template and write it to file.
+
+    Template is compiled only if SCSS sources or qtsass version changed
+    since it was written, unless force is True.
+    """
+    if not force and os.path.isfile(template_filepath):
+        try:
+            template = QssTemplate.load(template_filepath)
+        except ValueError:
+            template = None
+        if (template is not None and template.sources == _read_scss_sources()[2]
+                and template.header == HEADER_QSS.format(qtsass.__version__)):
+            _logger.debug("Stylesheet template is up to date: %s", template_filepath)
+            return template
+
+    template = compile_qss_template()
+    template.save(template_filepath)
+    return template
+
+
 def create_qss(qss_filepath=QSS_FILEPATH, main_scss_filepath=MAIN_SCSS_FILEPATH,
                variables_scss_filepath=VARIABLES_SCSS_FILEPATH,
                palette=BasePalette):
     """Create variables files and run qtsass compilation."""
     _create_scss_variables(variables_scss_filepath, palette)
-    stylesheet = _create_qss(main_scss_filepath, qss_filepath)
+
+    if main_scss_filepath != MAIN_SCSS_FILEPATH:
+        return _create_qss(main_scss_filepath, qss_filepath)
+
+    stylesheet = compile_qss_string(palette)
+    with open(qss_filepath, 'w') as f:
+        f.write(stylesheet)
 
     return stylesheet
 
@@ -199,16 +350,12 @@ def create_custom_qss(
     create_images(rc_path=theme_rc_path, palette=custom_palette)
     create_palette_image(path=theme_root_path, palette=custom_palette)
 
-    # Compile SCSS
+    # Render stylesheet from template, variables file is kept for copied SCSS sources
     variables_scss_filepath = os.path.join(theme_qss_path, VARIABLES_SCSS_FILE)
     theme_main_scss_filepath = os.path.join(theme_qss_path, MAIN_SCSS_FILE)
     theme_qss_filepath = os.path.join(theme_root_path, QSS_FILE)
-    stylesheet = create_qss(
-        qss_filepath=theme_qss_filepath,
-        main_scss_filepath=theme_main_scss_filepath,
-        variables_scss_filepath=variables_scss_filepath,
-        palette=custom_palette,
-    )
+    _create_scss_variables(variables_scss_filepath, custom_palette)
+    stylesheet = render_qss(custom_palette)
 
     # Update colors in text
     with open(theme_main_scss_filepath, 'r') as fh:
@@ -217,7 +364,6 @@ def create_custom_qss(
     for key, color in palette.color_palette().items():
         custom_color = custom_palette.color_palette()[key].upper()
         data = data.replace(color, custom_color)
-        stylesheet = stylesheet.replace(color, custom_color)
 
     with open(theme_main_scss_filepath, 'w') as fh:
         fh.write(data)
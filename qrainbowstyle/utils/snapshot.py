@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Snapshots of loaded stylesheets.
+
+Snapshot is one file in user cache directory with patched stylesheet and
+palette variables of style, for one Qt binding, Qt version and OS. Loading
+style from snapshot skips reading stylesheet from resources and applying
+patches, only resources of style are registered. Registered palette of style
+is reused, stored variables only recreate palette which is not registered.
+
+Snapshot is used only if it was written by the same package version from
+the same generated style files, stylesheet is checked against its stored
+hash. Invalid snapshots are ignored and written again.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import logging
+import os
+import sys
+
+# Local imports
+from qrainbowstyle import RC_MANIFEST_FILE, QSS_FILE, RCC_FILE, STYLES_PATH, __version__
+
+SNAPSHOT_VERSION = 1
+
+# Environment variable overriding snapshot directory
+SNAPSHOT_DIR_ENV = 'QRAINBOWSTYLE_CACHE_DIR'
+
+_logger = logging.getLogger(__name__)
+
+
+def get_snapshot_dir():
+    """Return directory of snapshots in user cache directory."""
+    path = os.environ.get(SNAPSHOT_DIR_ENV)
+    if path:
+        return path
+
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'qrainbowstyle', 'Cache')
+    if sys.platform == 'darwin':
+        return os.path.join(os.path.expanduser('~'), 'Library', 'Caches', 'qrainbowstyle')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'qrainbowstyle')
+
+
+def get_snapshot_filepath(key):
+    """Return path of snapshot file of (style, qt_api, qt_version, system) key."""
+    name = '-'.join(str(part) for part in key).lower()
+    return os.path.join(get_snapshot_dir(), 'snapshot-{}.json'.format(name))
+
+
+def _get_sources_signature(style):
+    """Return signature of generated files of style, changes when style is regenerated."""
+    signature = []
+    for name in (QSS_FILE, RCC_FILE, RC_MANIFEST_FILE):
+        try:
+            stat = os.stat(os.path.join(STYLES_PATH, style, name))
+        except OSError:
+            continue
+        signature.append([name, stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def save_snapshot(key, palette, stylesheet):
+    """
+    Write snapshot of loaded style.
+
+    File is replaced atomically, errors are logged and ignored.
+
+    Args:
+        key (tuple): Style directory name, Qt binding, Qt version and OS.
+        palette (BasePalette): Palette of style.
+        stylesheet (str): Stylesheet with patches applied.
+    """
+    filepath = get_snapshot_filepath(key)
+    data = {"snapshot": SNAPSHOT_VERSION,
+            "version": __version__,
+            "key": list(key),
+            "sources": _get_sources_signature(key[0]),
+            "palette": palette.__name__,
+            "variables": {name: getattr(palette, name) for name in dir(palette) if name.isupper()},
+            "hash": _hash(stylesheet),
+            "stylesheet": stylesheet}
+
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        temp_filepath = '{}.{}.tmp'.format(filepath, os.getpid())
+        with open(temp_filepath, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, separators=(',', ':'))
+        os.replace(temp_filepath, filepath)
+    except OSError:
+        _logger.warning("Failed to write stylesheet snapshot: %s", filepath, exc_info=True)
+        return
+    _logger.debug("Saved stylesheet snapshot: %s", filepath)
+
+
+def load_snapshot(key):
+    """
+    Read snapshot of style if it is valid.
+
+    Args:
+        key (tuple): Style directory name, Qt binding, Qt version and OS.
+
+    Returns:
+        tuple: palette class and stylesheet, or None if there is no valid
+        snapshot. Palette class is the registered palette of style, or it
+        is created from stored variables if palette is not registered.
+    """
+    filepath = get_snapshot_filepath(key)
+    try:
+        with open(filepath, 'r', encoding='utf-8') as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        _logger.warning("Failed to read stylesheet snapshot: %s", filepath, exc_info=True)
+        return None
+
+    if (not isinstance(data, dict)
+            or data.get("snapshot") != SNAPSHOT_VERSION
+            or data.get("version") != __version__
+            or data.get("key") != list(key)
+            or data.get("sources") != _get_sources_signature(key[0])
+            or not isinstance(data.get("stylesheet"), str)
+            or data.get("hash") != _hash(data["stylesheet"])):
+        _logger.debug("Stylesheet snapshot is outdated: %s", filepath)
+        return None
+
+    from qrainbowstyle.palette import BasePalette
+    from qrainbowstyle.registry import find_palette
+
+    variables = data.get("variables")
+    if not isinstance(variables, dict):
+        _logger.debug("Stylesheet snapshot is outdated: %s", filepath)
+        return None
+
+    palette = find_palette(data["palette"])
+    if palette is None:
+        palette = type(data["palette"], (BasePalette,), variables)
+    elif any(getattr(palette, name, None) != value for name, value in variables.items()):
+        # registered palette was changed since snapshot was written
+        _logger.debug("Stylesheet snapshot is outdated: %s", filepath)
+        return None
+    _logger.debug("Loaded stylesheet snapshot: %s", filepath)
+    return palette, data["stylesheet"]
+
+
+def clear_snapshots():
+    """Remove all snapshot files."""
+    snapshot_dir = get_snapshot_dir()
+    if not os.path.isdir(snapshot_dir):
+        return
+    for entry in os.scandir(snapshot_dir):
+        if entry.name.startswith('snapshot-') and entry.name.endswith('.json'):
+            try:
+                os.remove(entry.path)
+            except OSError:
+                _logger.warning("Failed to remove stylesheet snapshot: %s", entry.path)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Switching of application style.
+
+Qt parses application stylesheet again and re-polishes every widget when
+stylesheet changes, so cost of switch grows with number of widgets, not
+with number of changed rules. All styles are rendered from the same
+template and have the same rules, only property values differ, so switcher
+compares rules of current and new stylesheet and skips re-polishing when
+none of them changed, e.g. when the same style is selected again. Only
+resources and palette of style are updated then.
+
+Every switch is measured, see StyleSwitcher.lastSwitchInfo().
+
+Note that palette() references in stylesheets are resolved when widget is
+polished, changing QPalette of application does not restyle widgets.
+"""
+
+# Standard library imports
+import logging
+import re
+import time
+
+# Third party imports
+from qtpy.QtWidgets import QApplication
+
+# Local imports
+import qrainbowstyle
+
+_logger = logging.getLogger(__name__)
+
+_rule_pattern = re.compile(r'([^{}]+)\{([^{}]*)\}')
+
+
+def split_rules(stylesheet):
+    """Return list of (selector, declarations) of stylesheet rules."""
+    return [(selector.strip(), body.strip()) for selector, body in _rule_pattern.findall(stylesheet)]
+
+
+def diff_stylesheets(old, new):
+    """
+    Compare rules of two stylesheets.
+
+    Args:
+        old (str): Current stylesheet.
+        new (str): New stylesheet.
+
+    Returns:
+        dict: number of rules of new stylesheet, number of rules which
+        differ and whether selectors differ (stylesheets are not rendered
+        from the same template).
+    """
+    old_rules = split_rules(old)
+    new_rules = split_rules(new)
+
+    structural = [selector for selector, _ in old_rules] != [selector for selector, _ in new_rules]
+    if not old_rules and not new_rules:
+        # nothing to compare, e.g. declarations without selectors
+        structural = old != new
+    if structural:
+        changed = len(set(old_rules) ^ set(new_rules))
+    else:
+        changed = sum(1 for old_rule, new_rule in zip(old_rules, new_rules) if old_rule != new_rule)
+    return {"rules": len(new_rules), "changed": changed, "structural": structural}
+
+
+class StyleSwitcher:
+    """Switch stylesheet of application, widgets are re-polished only if rules changed.
+
+    Args:
+        app (QApplication): Application. Defaults to current instance.
+    """
+
+    def __init__(self, app=None):
+        super(StyleSwitcher, self).__init__()
+        self.app = app or QApplication.instance()
+        self.__info = None
+
+    def lastSwitchInfo(self) -> dict:
+        """Return statistics of last switch, see apply()."""
+        return self.__info
+
+    def switch(self, qt_api='', style='qdarkstyle3', palette=None) -> dict:
+        """
+        Load style and apply it to application, see load_stylesheet() and apply().
+
+        Returns:
+            dict: statistics of switch.
+        """
+        return self.apply(qrainbowstyle.load_stylesheet(qt_api=qt_api, style=style, palette=palette))
+
+    def apply(self, stylesheet) -> dict:
+        """
+        Set stylesheet on application if it differs from current one.
+
+        Args:
+            stylesheet (str): Loaded stylesheet.
+
+        Returns:
+            dict: number of rules, number of changed rules, whether
+            selectors changed, whether setting stylesheet was skipped,
+            number of widgets and time of re-polishing in seconds.
+        """
+        current = self.app.styleSheet()
+        widgets = len(self.app.allWidgets())
+
+        if stylesheet == current:
+            info = {"rules": None, "changed": 0, "structural": False}
+        else:
+            info = diff_stylesheets(current, stylesheet)
+
+        if not info["changed"] and not info["structural"]:
+            # only comments or formatting differ
+            info.update(skipped=True, widgets=widgets, time=0.0)
+            _logger.debug("Stylesheet rules did not change, widgets are not re-polished")
+        else:
+            # widgets are re-polished synchronously
+            start = time.perf_counter()
+            self.app.setStyleSheet(stylesheet)
+            info.update(skipped=False, widgets=widgets, time=time.perf_counter() - start)
+            _logger.info("Re-polished %d widgets in %.0f ms, %d of %d rules changed",
+                         widgets, info["time"] * 1000, info["changed"], info["rules"])
+
+        self.__info = info
+        return info
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Precompiled stylesheet template.
+
+Stylesheet of every palette is the same document with palette values
+substituted. Template is compiled once from SCSS sources with placeholder
+tokens (see ``qrainbowstyle.utils.scss.create_qss_template``) and stored
+as text with offsets of placeholders, so stylesheet of any palette is
+rendered by joining template slices with palette values, without qtsass.
+"""
+
+# Standard library imports
+import json
+import logging
+import re
+import threading
+
+# Local imports
+from qrainbowstyle import QSS_TEMPLATE_FILEPATH
+
+TEMPLATE_VERSION = 1
+
+# Prefix of placeholder tokens used while compiling template
+TOKEN_PREFIX = 'qrainbowstyle-var-'
+
+_logger = logging.getLogger(__name__)
+
+_reference_pattern = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)')
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def _unquote(value):
+    """Return string value without sass quotes."""
+    if len(value) > 1 and value[0] == value[-1] and value[0] in '\'"':
+        return value[1:-1]
+    return value
+
+
+def resolve_variables(palette):
+    """
+    Return palette variables as they appear in compiled stylesheet.
+
+    References to other variables (e.g. '1px solid $COLOR_BACKGROUND_1')
+    are resolved and quotes of strings are removed.
+
+    Args:
+        palette (BasePalette or dict): Palette class or dictionary of
+            variable names to values.
+
+    Returns:
+        dict: variable names to values.
+    """
+    variables = dict(palette) if isinstance(palette, dict) else palette.to_dict()
+    resolved = {}
+
+    def resolve(name, stack=()):
+        if name in resolved:
+            return resolved[name]
+        if name in stack:
+            raise ValueError("Circular reference of palette variable: {}".format(name))
+        try:
+            value = str(variables[name])
+        except KeyError:
+            raise KeyError("Palette variable {} is not defined".format(name))
+        if '$' in value:
+            value = _reference_pattern.sub(lambda match: resolve(match.group(1), stack + (name,)), value)
+        resolved[name] = value = _unquote(value)
+        return value
+
+    for name in variables:
+        resolve(name)
+    return resolved
+
+
+class QssTemplate:
+    """Stylesheet with placeholders of palette variables.
+
+    Args:
+        text (str): Stylesheet without placeholders.
+        placeholders (list(tuple)): Offsets in text and names of variables,
+            sorted by offset.
+        header (str): Header prepended to rendered stylesheet.
+        sources (str): Hash of SCSS sources template was compiled from.
+    """
+
+    def __init__(self, text, placeholders, header='', sources=None):
+        super(QssTemplate, self).__init__()
+        self.text = text
+        self.placeholders = [(int(offset), name) for offset, name in placeholders]
+        self.header = header
+        self.sources = sources
+
+        offsets = [0] + [offset for offset, _ in self.placeholders] + [len(text)]
+        self.__slices = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        self.__names = [name for _, name in self.placeholders]
+
+    def variables(self) -> list:
+        """Return names of variables used in template."""
+        return sorted(set(self.__names))
+
+    def render(self, palette) -> str:
+        """
+        Return stylesheet of palette.
+
+        Args:
+            palette (BasePalette or dict): Palette class or dictionary of
+                variable names to values.
+
+        Returns:
+            str: stylesheet string (css).
+        """
+        values = resolve_variables(palette)
+        try:
+            parts = [values[name] for name in self.__names]
+        except KeyError as error:
+            raise KeyError("Palette variable {} is not defined".format(error.args[0]))
+
+        # interleave slices with values, slices are one longer
+        output = [None] * (len(self.__slices) + len(parts))
+        output[0::2] = self.__slices
+        output[1::2] = parts
+        return self.header + ''.join(output)
+
+    def save(self, path):
+        """Write template to file."""
+        with open(path, 'w') as fh:
+            json.dump({"version": TEMPLATE_VERSION, "sources": self.sources, "header": self.header,
+                       "placeholders": self.placeholders, "text": self.text}, fh)
+        _logger.info("Created stylesheet template: %s", path)
+
+    @classmethod
+    def load(cls, path):
+        """Read template from file."""
+        with open(path, 'r') as fh:
+            data = json.load(fh)
+        if data.get("version") != TEMPLATE_VERSION:
+            raise ValueError("Unsupported stylesheet template version: {}".format(data.get("version")))
+        return cls(data["text"], data["placeholders"], data["header"], data["sources"])
+
+    @classmethod
+    def fromTokens(cls, stylesheet, header='', sources=None):
+        """Create template from stylesheet compiled with placeholder tokens."""
+        pattern = re.compile(re.escape(TOKEN_PREFIX) + r'([A-Za-z0-9_]+)')
+        text = []
+        placeholders = []
+        offset = 0
+        position = 0
+        for match in pattern.finditer(stylesheet):
+            text.append(stylesheet[position:match.start()])
+            offset += match.start() - position
+            placeholders.append((offset, match.group(1)))
+            position = match.end()
+        text.append(stylesheet[position:])
+        return cls(''.join(text), placeholders, header, sources)
+
+
+def get_qss_template(path=QSS_TEMPLATE_FILEPATH):
+    """Return template read from file, file is read only once."""
+    with _templates_lock:
+        template = _templates.get(path)
+        if template is None:
+            template = _templates[path] = QssTemplate.load(path)
+    return template
+
+
+def render_qss(palette, template=None):
+    """
+    Render stylesheet of palette from precompiled template.
+
+    Args:
+        palette (BasePalette or dict): Palette class or dictionary of
+            variable names to values.
+        template (QssTemplate): Template to render. Defaults to template
+            shipped with package.
+
+    Returns:
+        str: stylesheet string (css).
+    """
+    return (template or get_qss_template()).render(palette)
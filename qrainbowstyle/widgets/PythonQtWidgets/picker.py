@@ -1,9 +1,8 @@
-from qtpy.QtWidgets import QGridLayout, QHBoxLayout, QVBoxLayout, QWidget, QPushButton, QApplication
+from qtpy.QtWidgets import QGridLayout, QHBoxLayout, QVBoxLayout, QWidget, QPushButton
 from qtpy.QtCore import Signal, QSize
 from qtpy.QtGui import QPixmap, QPainter, QPen, QColor, QIcon
 
 import qrainbowstyle
-from qrainbowstyle.utils import setStylesheetOnQApp
 
 
 class Painter(QWidget):
@@ -87,7 +86,7 @@ class _PaletteLinearBase(_PaletteBase):
 
         for c in colors:
             b = _PaletteButton(c)
-            b.pressed.connect(lambda color=c: setStylesheetOnQApp(style=color["name"]))
+            b.pressed.connect(lambda color=c: qrainbowstyle.load_stylesheet_async(style=color["name"]))
             palette.addWidget(b)
 
         self.setLayout(palette)
@@ -117,7 +116,7 @@ class StylePickerGrid(QWidget):
 
         for c in colors:
             b = _PaletteButton(c)
-            b.pressed.connect(lambda color=c: setStylesheetOnQApp(style=color["name"]))
+            b.pressed.connect(lambda color=c: qrainbowstyle.load_stylesheet_async(style=color["name"]))
             palette.addWidget(b, row, col)
             col += 1
             if col == n_columns:
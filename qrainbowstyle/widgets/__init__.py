@@ -1,4 +1,26 @@
-from qrainbowstyle.widgets.QtWaitingSpinner.pyqtspinner import WaitingSpinner
-from qrainbowstyle.widgets.PythonQtWidgets.picker import (StylePickerGrid, StylePickerVertical,
-                                                          StylePickerHorizontal)
-from qrainbowstyle.widgets.QRoundProgressBar.qroundprogressbar import QRoundProgressBar
+import importlib
+
+# Widgets are imported on first access, so using one widget does not
+# import modules of the others
+_WIDGET_MODULES = {
+    "WaitingSpinner": "qrainbowstyle.widgets.QtWaitingSpinner.pyqtspinner",
+    "StylePickerGrid": "qrainbowstyle.widgets.PythonQtWidgets.picker",
+    "StylePickerVertical": "qrainbowstyle.widgets.PythonQtWidgets.picker",
+    "StylePickerHorizontal": "qrainbowstyle.widgets.PythonQtWidgets.picker",
+    "QRoundProgressBar": "qrainbowstyle.widgets.QRoundProgressBar.qroundprogressbar",
+}
+
+__all__ = list(_WIDGET_MODULES)
+
+
+def __getattr__(name):
+    module = _WIDGET_MODULES.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    widget = getattr(importlib.import_module(module), name)
+    globals()[name] = widget
+    return widget
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,10 +1,17 @@
 import logging
 
 from qtpy.QtCore import QObject, QRect, Qt, QPoint, QSize, QEvent
-from qtpy.QtGui import QMouseEvent, QCursor, QGuiApplication
+from qtpy.QtGui import QMouseEvent
 from qtpy.QtWidgets import QWidget
 
 from .base import FramelessWindowBase
+from .base.Grips import GeometryThrottle, createGrips, startSystemMove
+from .base.Screens import getScreenCache
+
+# Events handled by window event filter, others are passed through
+# before any other work is done
+FILTERED_EVENTS = frozenset((QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseMove,
+                             QEvent.MouseButtonDblClick, QEvent.Leave))
 
 
 class FramelessWindow(FramelessWindowBase):
@@ -13,10 +20,14 @@ class FramelessWindow(FramelessWindowBase):
     - window moving
     - window resizing
     - maximize on double click on titlebar
-    - snap to borders
+    - snap to borders of screen under cursor, half and quarter of screen
+
+    Args:
+        parent (QWidget): Parent widget.
+        resizeMode (str): How window is resized, see setResizeMode.
     """
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, resizeMode=FramelessWindowBase.ResizeTracking):
         super(FramelessWindow, self).__init__(parent)
 
         self.__titlebarHeight = 45
@@ -32,10 +43,86 @@ class FramelessWindow(FramelessWindowBase):
         self.__resizing = False
         self.__horizontalResizing = False
         self.__verticalResizing = False
+        self.__cursorShape = None
+
+        self.__resizeMode = None
+        self.__grips = []
+        self.__throttle = GeometryThrottle(self)
 
         self.installEventFilter(self)
         self.__updateGripRect()
-        self.setMouseTracking(True)
+        self.setResizeMode(resizeMode)
+
+    def setResizeMode(self, mode: str):
+        """Set how window is resized.
+
+        FramelessWindow.ResizeTracking enables mouse tracking on window and
+        its children and resizes window from its event filter.
+        FramelessWindow.ResizeGrips places thin transparent grips on edges
+        and corners of window, only grips handle mouse, window does not
+        enable mouse tracking on any widget. Application stylesheet with
+        hover rules still enables it on matching widgets when they are
+        polished, Qt needs it to update hover state of their sub-controls,
+        so it is left on, except for grips.
+        FramelessWindow.ResizeSystem uses same grips, but hands moving and
+        resizing to window manager with QWindow.startSystemMove and
+        QWindow.startSystemResize (Qt 5.15+). Window manager then does its own
+        snapping. When platform does not support it, grips mode is used.
+
+        Args:
+            mode (str): FramelessWindow.ResizeTracking, FramelessWindow.ResizeGrips
+                or FramelessWindow.ResizeSystem.
+        """
+        if mode not in (self.ResizeTracking, self.ResizeGrips, self.ResizeSystem):
+            raise ValueError("Unknown resize mode: {}".format(mode))
+        if mode == self.__resizeMode:
+            return
+
+        self.__resizeMode = mode
+        if mode == self.ResizeTracking:
+            self.setMouseTracking(True)
+        else:
+            if not self.__grips:
+                self.__grips = createGrips(self, self.__throttle)
+            for grip in self.__grips:
+                grip.setSystemResize(mode == self.ResizeSystem)
+            self.setMouseTracking(False)
+            self.__setCursorShape(Qt.ArrowCursor)
+        self.__updateGrips()
+
+    def resizeMode(self) -> str:
+        """Return how window is resized, see setResizeMode."""
+        return self.__resizeMode
+
+    def setResizeThrottling(self, value: bool):
+        """Apply geometry at most once per display frame while resizing.
+
+        Args:
+            value (bool): Enable or disable resize throttling.
+        """
+        self.__throttle.setEnabled(value)
+
+    def setResizeOutline(self, value: bool):
+        """Show only outline while resizing, window geometry is applied on release.
+
+        Args:
+            value (bool): Enable or disable resize outline.
+        """
+        self.__throttle.setOutlineEnabled(value)
+
+    def setResizingEnabled(self, value: bool):
+        """Enable window resizing
+
+        Args:
+            value (bool): Enable or disable window resizing
+        """
+        super().setResizingEnabled(value)
+        self.__updateGrips()
+
+    def changeEvent(self, event: QEvent) -> None:
+        if event.type() == QEvent.WindowStateChange:
+            self.__updateGrips()
+        return super().changeEvent(event)
 
     def setMouseTracking(self, flag):
         """Recursively enables mouse tracking for all child widgets.
@@ -57,7 +144,7 @@ class FramelessWindow(FramelessWindowBase):
         recursive_set(self)
 
     def __updateGripRect(self):
-        """Update rects for current window geometry."""
+        """Update rects for current window geometry, called on resize."""
         # corner grip
         self.__griprect = QRect(self.width() - self.__gripsize,
                                 self.height() - self.__gripsize,
@@ -76,6 +163,27 @@ class FramelessWindow(FramelessWindowBase):
                                  self.width() - self.__gripsize - self.__sideGripIgnore,
                                  self.__gripsize)
 
+    def __updateGrips(self):
+        """Show grips on edges of resizable window and hide them otherwise."""
+        visible = (self.__resizeMode != self.ResizeTracking
+                   and self.isResizingEnabled()
+                   and self.windowState() not in (Qt.WindowFullScreen, Qt.WindowMaximized))
+        for grip in self.__grips:
+            if visible:
+                grip.place()
+            grip.setVisible(visible)
+
+    def __resize(self, width, height):
+        """Resize window through throttle, top left corner stays in place."""
+        size = QSize(width, height).expandedTo(self.minimumSize().expandedTo(self.minimumSizeHint()))
+        self.__throttle.setGeometry(QRect(self.geometry().topLeft(), size.boundedTo(self.maximumSize())))
+
+    def __setCursorShape(self, shape):
+        """Set cursor shape if it changed since last call."""
+        if shape != self.__cursorShape:
+            self.__cursorShape = shape
+            self.setCursor(shape)
+
     def eventFilter(self, widget, event: QEvent):
         """Handle frameless window events.
 
@@ -83,74 +191,84 @@ class FramelessWindow(FramelessWindowBase):
             widget (QObject): Widget.
             event (QEvent): Event.
         """
-        if (hasattr(widget, "window")
+        event_type = event.type()
+        if event_type not in FILTERED_EVENTS:
+            if event_type == QEvent.Resize and widget is self:
+                self.__updateGripRect()
+                self.__updateGrips()
+            return super().eventFilter(widget, event)
+
+        if (widget is self
+                or hasattr(widget, "window")
                 and widget.window() is self):
-            self.__updateGripRect()
+            titlebar = self.titlebar()
 
-            if (hasattr(event, "x")
-                    and self.titlebar().rect().contains(self.mapFromParent(QCursor.pos()))
-                    and self.titlebar().mouseOverTitlebar(event.x(), event.y())):
+            if (event_type != QEvent.Leave
+                    and titlebar.rect().contains(self.mapFromParent(event.globalPos()))
+                    and titlebar.mouseOverTitlebar(event.x(), event.y())):
                 # when cursor is over titlebar
 
-                if event.type() == QMouseEvent.MouseButtonPress and event.buttons() == Qt.LeftButton:
+                if event_type == QMouseEvent.MouseButtonPress and event.buttons() == Qt.LeftButton:
                     # if titlebar clicked with left button
+                    if (self.__resizeMode == self.ResizeSystem
+                            and self.windowState() == Qt.WindowNoState
+                            and startSystemMove(self)):
+                        # window manager moves window
+                        return super().eventFilter(widget, event)
                     self.__moving = True
-                    margins = self.titlebar().contentsMargins()
-                    self.__move_offset = event.pos() + self.titlebar().pos() - QPoint(margins.left(), margins.top())
+                    margins = titlebar.contentsMargins()
+                    self.__move_offset = event.pos() + titlebar.pos() - QPoint(margins.left(), margins.top())
 
-                elif event.type() == QMouseEvent.MouseMove and event.buttons() == Qt.LeftButton:
+                elif event_type == QMouseEvent.MouseMove and event.buttons() == Qt.LeftButton:
                     # if holding left button and moving window
                     if self.__moving:
                         if self.windowState() == Qt.WindowMaximized:
                             self.setWindowState(Qt.WindowNoState)
-                            self.titlebar().on_btnRestore_clicked()
+                            titlebar.on_btnRestore_clicked()
                             self.move(event.pos() - self.mapFromParent(event.pos()))
                             self.__moving = False
                         else:
                             self.move(event.globalPos() - self.__move_offset)
 
-                elif event.type() == QMouseEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+                elif event_type == QMouseEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
                     # if left button released
                     self.__moving = False
-                    screen = QGuiApplication.primaryScreen().availableGeometry()
-                    if event.globalY() == 0:
+                    screens = getScreenCache()
+                    geometry, maximize = screens.snapGeometry(event.globalPos())
+                    if maximize:
                         # snap to top edge
-                        self.titlebar().on_btnMaximize_clicked()
+                        titlebar.on_btnMaximize_clicked()
 
-                    elif event.globalX() == 0:
-                        # snap to left edge
-                        self.move(QPoint(0, 0))
-                        self.resize(QSize(screen.width() / 2, screen.height()))
+                    elif geometry is not None:
+                        # snap to half or quarter of screen
+                        self.setGeometry(geometry)
                         self.setWindowState(Qt.WindowNoState)
 
-                    elif event.globalX() + 1 >= screen.width():
-                        # snap to right edge
-                        self.move(QPoint(screen.width() / 2, 0))
-                        self.resize(QSize(screen.width() / 2, screen.height()))
-                        self.setWindowState(Qt.WindowNoState)
-
-                    elif self.geometry().y() < 0:
+                    else:
                         # move window if top of window is outside display
-                        self.move(QPoint(self.geometry().x(), 0))
+                        top = screens.screenAt(event.globalPos())[0].top()
+                        if self.geometry().y() < top:
+                            self.move(QPoint(self.geometry().x(), top))
 
-                elif event.type() == QMouseEvent.MouseButtonDblClick:
+                elif event_type == QMouseEvent.MouseButtonDblClick:
                     # maximize/restore on double click
                     if self.windowState() == Qt.WindowMaximized:
                         self.setWindowState(Qt.WindowNoState)
                     elif self.windowState() == Qt.WindowNoState:
                         self.showMaximized()
 
-            elif event.type() == QEvent.Leave and widget is self.titlebar():
+            elif event_type == QEvent.Leave and widget is titlebar:
                 # fixes __moving remain True after clicking titlebar on border and leaving titlebar
                 self.__moving = False
 
-            elif (self.windowState() not in (Qt.WindowFullScreen, Qt.WindowMaximized)
+            elif (self.__resizeMode == self.ResizeTracking
+                    and self.windowState() not in (Qt.WindowFullScreen, Qt.WindowMaximized)
                     and self.isResizingEnabled()):
                 # when cursor is not over titlebar
                 # and window is not maximized or in full screen mode
 
                 # button pressed
-                if event.type() == QMouseEvent.MouseButtonPress:
+                if event_type == QMouseEvent.MouseButtonPress:
                     if self.__griprect.contains(
                             event.pos()) and not self.__horizontalResizing and not self.__verticalResizing:
                         # corner grip
@@ -166,46 +284,47 @@ class FramelessWindow(FramelessWindowBase):
                         # bottom grip
                         self.__verticalResizing = True
 
-                if event.type() == QMouseEvent.MouseButtonRelease:
+                if event_type == QMouseEvent.MouseButtonRelease:
                     # stop resizing
                     if self.__resizing or self.__horizontalResizing or self.__verticalResizing:
                         self.__resizing = False
                         self.__horizontalResizing = False
                         self.__verticalResizing = False
-                        self.setCursor(Qt.ArrowCursor)
+                        self.__throttle.flush()
+                        self.__setCursorShape(Qt.ArrowCursor)
 
-                if event.type() == QMouseEvent.MouseMove:
+                if event_type == QMouseEvent.MouseMove:
                     # moving cursor while holding left button -> resize
 
                     if self.__resizing and not self.__horizontalResizing and not self.__verticalResizing:
                         if event.buttons() == Qt.LeftButton:
-                            self.setCursor(Qt.SizeFDiagCursor)
-                            self.resize(QSize(event.x(), event.y()))
+                            self.__setCursorShape(Qt.SizeFDiagCursor)
+                            self.__resize(event.x(), event.y())
 
                     elif self.__horizontalResizing and not self.__resizing and not self.__verticalResizing:
                         if event.buttons() == Qt.LeftButton:
-                            self.setCursor(Qt.SizeHorCursor)
-                            self.resize(QSize(event.x(), self.height()))
+                            self.__setCursorShape(Qt.SizeHorCursor)
+                            self.__resize(event.x(), self.height())
 
                     elif self.__verticalResizing and not self.__resizing and not self.__horizontalResizing:
                         if event.buttons() == Qt.LeftButton:
-                            self.setCursor(Qt.SizeVerCursor)
-                            self.resize(QSize(self.width(), event.y()))
+                            self.__setCursorShape(Qt.SizeVerCursor)
+                            self.__resize(self.width(), event.y())
 
                     else:
                         if (self.__griprect.contains(event.pos())
                                 and not self.__horizontalResizing
                                 and not self.__verticalResizing):
-                            self.setCursor(Qt.SizeFDiagCursor)
+                            self.__setCursorShape(Qt.SizeFDiagCursor)
                         elif (self.__hgriprect.contains(event.pos())
                               and not self.__resizing
                               and not self.__verticalResizing):
-                            self.setCursor(Qt.SizeHorCursor)
+                            self.__setCursorShape(Qt.SizeHorCursor)
                         elif (self.__vgriprect.contains(event.pos())
                               and not self.__resizing
                               and not self.__horizontalResizing):
-                            self.setCursor(Qt.SizeVerCursor)
+                            self.__setCursorShape(Qt.SizeVerCursor)
                         else:
-                            self.setCursor(Qt.ArrowCursor)
+                            self.__setCursorShape(Qt.ArrowCursor)
 
         return super().eventFilter(widget, event)
@@ -14,10 +14,10 @@ if sys.platform == "win32":
 else:
     raise Exception("Windows API is not supported on non Windows OS.")
 
-from qtpy.QtGui import QGuiApplication
 from qtpy.QtCore import QMetaObject, Slot
 
 from .base import FramelessWindowBase
+from .base.Screens import getScreenCache
 
 
 class MINMAXINFO(ctypes.Structure):
@@ -44,8 +44,6 @@ class FramelessWindow(FramelessWindowBase):
 
     def __init__(self, parent=None):
         super(FramelessWindow, self).__init__(parent)
-        self.__rect = QGuiApplication.primaryScreen().availableGeometry()
-
         self.__titlebarHeight = 45
         self.__borderWidth = 3
 
@@ -151,9 +149,12 @@ class FramelessWindow(FramelessWindowBase):
             elif msg.message == win32con.WM_GETMINMAXINFO:
                 info = ctypes.cast(
                     msg.lParam, ctypes.POINTER(MINMAXINFO)).contents
-                info.ptMaxSize.x = self.__rect.width()
-                info.ptMaxSize.y = self.__rect.height() - 1
-                info.ptMaxPosition.x, info.ptMaxPosition.y = 0, 0
+                # maximize on screen of window, position is relative to that screen
+                geometry, available = getScreenCache().screenAt(self.frameGeometry().center())
+                info.ptMaxSize.x = available.width()
+                info.ptMaxSize.y = available.height() - 1
+                info.ptMaxPosition.x = available.x() - geometry.x()
+                info.ptMaxPosition.y = available.y() - geometry.y()
                 return True, 0
 
             elif msg.message == win32con.WM_NCHITTEST:
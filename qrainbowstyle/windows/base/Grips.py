@@ -0,0 +1,247 @@
+from qtpy.QtWidgets import QWidget, QRubberBand
+from qtpy.QtCore import Qt, QEvent, QObject, QPoint, QRect, QTimer
+
+# Thickness of edge grips and side of corner grips in pixels
+GRIP_SIZE = 4
+CORNER_GRIP_SIZE = 12
+
+# Refresh rate used when screen does not report one
+DEFAULT_REFRESH_RATE = 60
+
+GRIP_CURSORS = {
+    int(Qt.LeftEdge): Qt.SizeHorCursor,
+    int(Qt.RightEdge): Qt.SizeHorCursor,
+    int(Qt.TopEdge): Qt.SizeVerCursor,
+    int(Qt.BottomEdge): Qt.SizeVerCursor,
+    int(Qt.TopEdge | Qt.LeftEdge): Qt.SizeFDiagCursor,
+    int(Qt.BottomEdge | Qt.RightEdge): Qt.SizeFDiagCursor,
+    int(Qt.TopEdge | Qt.RightEdge): Qt.SizeBDiagCursor,
+    int(Qt.BottomEdge | Qt.LeftEdge): Qt.SizeBDiagCursor,
+}
+
+
+def startSystemMove(window) -> bool:
+    """Let window manager move window, return False if it is not supported.
+
+    QWindow.startSystemMove is available since Qt 5.15 and platform may still refuse it.
+    """
+    handle = window.windowHandle()
+    if handle is None or not hasattr(handle, "startSystemMove"):
+        return False
+    return handle.startSystemMove()
+
+
+def startSystemResize(window, edges) -> bool:
+    """Let window manager resize window by edges, return False if it is not supported.
+
+    QWindow.startSystemResize is available since Qt 5.15 and platform may still refuse it.
+    """
+    handle = window.windowHandle()
+    if handle is None or not hasattr(handle, "startSystemResize"):
+        return False
+    return handle.startSystemResize(Qt.Edges(edges))
+
+
+def resizedGeometry(geometry: QRect, edges, delta: QPoint, minimum) -> QRect:
+    """Return geometry with edges moved by delta, size is not smaller than minimum.
+
+    Args:
+        geometry (QRect): Window geometry when resizing started.
+        edges (Qt.Edges): Dragged edges.
+        delta (QPoint): Cursor movement since resizing started.
+        minimum (QSize): Minimum window size.
+    """
+    edges = int(edges)
+    left, top, right, bottom = geometry.left(), geometry.top(), geometry.right(), geometry.bottom()
+    if edges & int(Qt.LeftEdge):
+        left = min(left + delta.x(), right - minimum.width() + 1)
+    if edges & int(Qt.RightEdge):
+        right = max(right + delta.x(), left + minimum.width() - 1)
+    if edges & int(Qt.TopEdge):
+        top = min(top + delta.y(), bottom - minimum.height() + 1)
+    if edges & int(Qt.BottomEdge):
+        bottom = max(bottom + delta.y(), top + minimum.height() - 1)
+    return QRect(QPoint(left, top), QPoint(right, bottom))
+
+
+class GeometryThrottle(QObject):
+    """Coalesce geometry changes of window while it is resized.
+
+    With throttling enabled, first requested geometry is applied at once and
+    following ones at most once per display frame, so layout of heavy content
+    is not recalculated on every mouse move. Frame timer is restarted whenever
+    it applies pending geometry and stops only after frame without requests.
+    With outline enabled, only rubber band is shown while dragging and window
+    geometry is applied by flush.
+
+    Args:
+        window (QWidget): Resized window.
+    """
+
+    def __init__(self, window):
+        super(GeometryThrottle, self).__init__(window)
+        self.__window = window
+        self.__pending = None
+        self.__outline = None
+        self.__outlineEnabled = False
+
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setTimerType(Qt.PreciseTimer)
+        self.__timer.timeout.connect(self.__onFrame)
+        self.__enabled = False
+
+    def setEnabled(self, value: bool):
+        self.__enabled = value
+
+    def isEnabled(self) -> bool:
+        return self.__enabled
+
+    def setOutlineEnabled(self, value: bool):
+        self.__outlineEnabled = value
+
+    def isOutlineEnabled(self) -> bool:
+        return self.__outlineEnabled
+
+    def setGeometry(self, geometry: QRect):
+        """Request new window geometry."""
+        if self.__outlineEnabled:
+            self.__pending = geometry
+            if self.__outline is None:
+                self.__outline = QRubberBand(QRubberBand.Rectangle)
+            self.__outline.setGeometry(geometry)
+            self.__outline.show()
+        elif not self.__enabled:
+            self.__window.setGeometry(geometry)
+        elif self.__timer.isActive():
+            self.__pending = geometry
+        else:
+            self.__window.setGeometry(geometry)
+            screen = self.__window.screen() if hasattr(self.__window, "screen") else None
+            rate = screen.refreshRate() if screen is not None else 0
+            self.__timer.start(int(1000 / (rate or DEFAULT_REFRESH_RATE)))
+
+    def flush(self):
+        """Apply last requested geometry and hide outline, called when resizing ends."""
+        self.__timer.stop()
+        if self.__outline is not None:
+            self.__outline.hide()
+        self.__apply()
+
+    def __onFrame(self):
+        if self.__pending is not None:
+            self.__apply()
+            self.__timer.start()
+
+    def __apply(self):
+        if self.__pending is not None:
+            geometry, self.__pending = self.__pending, None
+            self.__window.setGeometry(geometry)
+
+
+class EdgeGrip(QWidget):
+    """Transparent widget on window edge or corner, resizes window when dragged.
+
+    Grip shows resize cursor on hover without mouse tracking, so no other
+    widget of window needs to track mouse. With system resize enabled,
+    dragging is handed over to window manager when platform supports it.
+
+    Args:
+        window (QWidget): Resized window, parent of grip.
+        edges (Qt.Edges): Window edges moved by grip.
+        throttle (GeometryThrottle): Applies geometry to window, window is resized directly if None.
+    """
+
+    def __init__(self, window, edges, throttle=None):
+        super(EdgeGrip, self).__init__(window)
+        self.edges = edges
+        self.__throttle = throttle
+        self.__systemResize = False
+        self.__pressPos = None
+        self.__pressGeometry = None
+
+        self.setAttribute(Qt.WA_NoSystemBackground)
+        self.setCursor(GRIP_CURSORS[int(edges)])
+
+    def setSystemResize(self, value: bool):
+        """Resize window by window manager, grip resizes window itself as fallback."""
+        self.__systemResize = value
+
+    def isResizing(self) -> bool:
+        """Return True while grip is dragged."""
+        return self.__pressPos is not None
+
+    def place(self):
+        """Place grip on its edge of parent window."""
+        width, height = self.parentWidget().width(), self.parentWidget().height()
+        edges = int(self.edges)
+
+        if edges & int(Qt.LeftEdge):
+            x = 0
+        elif edges & int(Qt.RightEdge):
+            x = width - (CORNER_GRIP_SIZE if edges & int(Qt.TopEdge | Qt.BottomEdge) else GRIP_SIZE)
+        else:
+            x = CORNER_GRIP_SIZE
+        if edges & int(Qt.TopEdge):
+            y = 0
+        elif edges & int(Qt.BottomEdge):
+            y = height - (CORNER_GRIP_SIZE if edges & int(Qt.LeftEdge | Qt.RightEdge) else GRIP_SIZE)
+        else:
+            y = CORNER_GRIP_SIZE
+
+        if edges in (int(Qt.LeftEdge), int(Qt.RightEdge)):
+            size = (GRIP_SIZE, height - 2 * CORNER_GRIP_SIZE)
+        elif edges in (int(Qt.TopEdge), int(Qt.BottomEdge)):
+            size = (width - 2 * CORNER_GRIP_SIZE, GRIP_SIZE)
+        else:
+            size = (CORNER_GRIP_SIZE, CORNER_GRIP_SIZE)
+
+        self.setGeometry(x, y, max(size[0], 0), max(size[1], 0))
+        self.raise_()
+
+    def event(self, event):
+        result = super().event(event)
+        if event.type() in (QEvent.Polish, QEvent.StyleChange):
+            # stylesheet with hover rules enables tracking while polishing, grip does not need it
+            self.setMouseTracking(False)
+        return result
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            if self.__systemResize and startSystemResize(self.window(), self.edges):
+                event.accept()
+                return
+            self.__pressPos = event.globalPos()
+            self.__pressGeometry = self.window().geometry()
+            event.accept()
+        else:
+            super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.__pressPos is not None and event.buttons() & Qt.LeftButton:
+            window = self.window()
+            minimum = window.minimumSize().expandedTo(window.minimumSizeHint())
+            target = window if self.__throttle is None else self.__throttle
+            target.setGeometry(resizedGeometry(self.__pressGeometry, self.edges,
+                                               event.globalPos() - self.__pressPos, minimum))
+            event.accept()
+        else:
+            super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self.__pressPos is not None and event.button() == Qt.LeftButton:
+            self.__pressPos = None
+            self.__pressGeometry = None
+            if self.__throttle is not None:
+                self.__throttle.flush()
+            event.accept()
+        else:
+            super().mouseReleaseEvent(event)
+
+
+def createGrips(window, throttle=None) -> list:
+    """Create grips on all edges and corners of window."""
+    return [EdgeGrip(window, edges, throttle) for edges in (
+        Qt.LeftEdge, Qt.RightEdge, Qt.TopEdge, Qt.BottomEdge,
+        Qt.TopEdge | Qt.LeftEdge, Qt.TopEdge | Qt.RightEdge,
+        Qt.BottomEdge | Qt.LeftEdge, Qt.BottomEdge | Qt.RightEdge)]
@@ -0,0 +1,130 @@
+from qtpy.QtGui import QGuiApplication
+from qtpy.QtCore import QObject, QRect, Signal
+
+# Distance from screen edge in pixels where dropped window snaps
+SNAP_DISTANCE = 1
+# Height of zones at top and bottom of left and right screen edges snapping to quarter of screen
+SNAP_CORNER_SIZE = 40
+
+_instances = {"app": None, "cache": None}
+
+
+class ScreenCache(QObject):
+    """Geometries of connected screens, refreshed when screens change.
+
+    Cache is updated from screenAdded, screenRemoved, primaryScreenChanged,
+    geometryChanged and availableGeometryChanged signals, so screens are not
+    queried while handling input events.
+
+    Signals:
+        changed: Screen geometries changed.
+
+    Args:
+        app (QGuiApplication): Application, defaults to current instance.
+    """
+
+    changed = Signal()
+
+    def __init__(self, app=None):
+        super(ScreenCache, self).__init__(app or QGuiApplication.instance())
+        self.__app = app or QGuiApplication.instance()
+        self.__screens = []
+        self.__primary = (QRect(), QRect())
+
+        self.__app.screenAdded.connect(self.__screenAdded)
+        self.__app.screenRemoved.connect(self.__screenRemoved)
+        self.__app.primaryScreenChanged.connect(self.__refresh)
+        for screen in self.__app.screens():
+            self.__watch(screen)
+        self.__refresh()
+
+    def screens(self) -> list:
+        """Return list of (geometry, available geometry) of connected screens."""
+        return list(self.__screens)
+
+    def primaryAvailableGeometry(self) -> QRect:
+        """Return available geometry of primary screen."""
+        return QRect(self.__primary[1])
+
+    def screenAt(self, pos) -> tuple:
+        """Return (geometry, available geometry) of screen under pos.
+
+        Nearest screen is returned when pos is outside of all screens.
+
+        Args:
+            pos (QPoint): Global position.
+        """
+        for geometry, available in self.__screens:
+            if geometry.contains(pos):
+                return QRect(geometry), QRect(available)
+        if not self.__screens:
+            return QRect(self.__primary[0]), QRect(self.__primary[1])
+
+        def distance(screen):
+            geometry = screen[0]
+            dx = max(geometry.left() - pos.x(), 0, pos.x() - geometry.right())
+            dy = max(geometry.top() - pos.y(), 0, pos.y() - geometry.bottom())
+            return dx + dy
+
+        geometry, available = min(self.__screens, key=distance)
+        return QRect(geometry), QRect(available)
+
+    def snapGeometry(self, pos) -> tuple:
+        """Return snap target of window dropped with cursor at pos.
+
+        Top edge maximizes window, left and right edges snap window to half of
+        screen and their top and bottom ends to quarter of screen.
+
+        Args:
+            pos (QPoint): Global cursor position.
+
+        Returns:
+            (QRect, bool): Window geometry or None if pos is not in snap zone,
+            True if window should be maximized.
+        """
+        geometry, available = self.screenAt(pos)
+        left = pos.x() < geometry.left() + SNAP_DISTANCE
+        right = pos.x() > geometry.right() - SNAP_DISTANCE
+        if not left and not right:
+            return None, pos.y() < geometry.top() + SNAP_DISTANCE
+
+        halfWidth = available.width() // 2
+        x = available.left() if left else available.left() + halfWidth
+        width = halfWidth if left else available.width() - halfWidth
+
+        halfHeight = available.height() // 2
+        if pos.y() < geometry.top() + SNAP_CORNER_SIZE:
+            return QRect(x, available.top(), width, halfHeight), False
+        if pos.y() > geometry.bottom() - SNAP_CORNER_SIZE:
+            return QRect(x, available.top() + halfHeight, width, available.height() - halfHeight), False
+        return QRect(x, available.top(), width, available.height()), False
+
+    def __watch(self, screen):
+        screen.geometryChanged.connect(self.__refresh)
+        screen.availableGeometryChanged.connect(self.__refresh)
+
+    def __screenAdded(self, screen):
+        self.__watch(screen)
+        self.__refresh()
+
+    def __screenRemoved(self, screen):
+        self.__refresh(removed=screen)
+
+    def __refresh(self, *args, removed=None):
+        screens = [screen for screen in self.__app.screens() if screen is not removed]
+        self.__screens = [(screen.geometry(), screen.availableGeometry()) for screen in screens]
+        primary = self.__app.primaryScreen()
+        if primary is not None and primary is not removed:
+            self.__primary = (primary.geometry(), primary.availableGeometry())
+        elif self.__screens:
+            self.__primary = self.__screens[0]
+        self.changed.emit()
+
+
+def getScreenCache() -> ScreenCache:
+    """Return screen cache of current application, created on first call."""
+    app = QGuiApplication.instance()
+    if _instances["cache"] is None or _instances["app"] is not app:
+        _instances["app"] = app
+        _instances["cache"] = ScreenCache(app)
+    return _instances["cache"]
@@ -1,18 +1,22 @@
 import qrainbowstyle
 from qtpy.QtWidgets import QWidget, QVBoxLayout, QSizePolicy, QDialog
-from qtpy.QtGui import QIcon, QGuiApplication
+from qtpy.QtGui import QIcon
 from qtpy.QtCore import Qt, QMetaObject, QEvent, QSize, Signal
 
+from .Screens import getScreenCache
 from .Titlebar import Titlebar
 
 
 class FramelessWindowBase(QDialog):
     closeClicked = Signal()
 
+    # Resize modes, see setResizeMode
+    ResizeTracking = 'tracking'
+    ResizeGrips = 'grips'
+    ResizeSystem = 'system'
+
     def __init__(self, parent):
         super(FramelessWindowBase, self).__init__(parent)
-        self.__rect = QGuiApplication.primaryScreen().availableGeometry()
-
         self.__resizingEnabled = True
         self.__contentWidgets = []
 
@@ -66,7 +70,8 @@ class FramelessWindowBase(QDialog):
 
         QMetaObject.connectSlotsByName(self)
         self.showSizeControl(True)
-        self.resize(QSize(int(self.__rect.width() / 2), int(self.__rect.height() / 2)))
+        available = getScreenCache().primaryAvailableGeometry()
+        self.resize(QSize(int(available.width() / 2), int(available.height() / 2)))
 
     def setContentsMargins(self, left, top, right, bottom):
         self.__contentWidgetLayout.setContentsMargins(left, top, right, bottom)
@@ -77,6 +82,15 @@ class FramelessWindowBase(QDialog):
     def setEdgeSnapping(self, value: bool):
         pass
 
+    def setResizeMode(self, mode: str):
+        pass
+
+    def setResizeThrottling(self, value: bool):
+        pass
+
+    def setResizeOutline(self, value: bool):
+        pass
+
     def setResizingEnabled(self, value: bool):
         """Enable window resizing
 
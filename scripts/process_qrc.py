@@ -8,6 +8,28 @@ The script will attempt to compile the qrc file using the following tools:
     - pyside6-rcc for PySide6 (Python)
     - rcc for Qt5 (C++)
 
+A binary .rcc file is always created for every style. It is preferred by
+load_stylesheet, because Qt memory-maps it instead of importing a large
+Python module. If rcc is not installed, the .rcc file is created from the
+compiled _rc.py module. Only _rc.py modules are committed, setup.py converts
+them to .rcc files when package is built, so installed package has one
+format.
+
+With --shared_rc option, png images of all styles are stored once in a
+content-addressed shared folder, every style gets a manifest mapping its
+icons to shared images and its own resources contain only the stylesheet.
+
+With --parallel option, palettes are built concurrently in worker
+processes. Resource compilers of all bindings run concurrently. Time
+spent in every stage of every palette is logged at the end of the build.
+
+Stylesheet template used to render stylesheets of custom palettes at
+runtime is compiled when SCSS sources change.
+
+Input hashes of every build stage are stored in a manifest in the style
+directory. Stages whose inputs (palette, svg files, SCSS sources and tool
+versions) did not change are skipped, use --force to rebuild everything.
+
 Delete the compiled files that you don't want to use manually after
 running this script.
 
@@ -25,156 +47,576 @@ Links to understand those tools:
 import os
 import sys
 import glob
+import json
+import time
+import queue
+import shutil
+import hashlib
 import logging
 import argparse
-from subprocess import call
+import tempfile
+import importlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from subprocess import Popen, call
 
 # Third party imports
+import qtsass
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
 # Local imports
-from qrainbowstyle import PACKAGE_PATH, STYLES_PATH, QRC_FILE, QSS_FILE
+import qrainbowstyle
+from qrainbowstyle import (PACKAGE_PATH, STYLES_PATH, QRC_FILE, QSS_FILE, RCC_FILE, RC_MANIFEST_FILE,
+                           SHARED_RC_PATH, SHARED_QRC_FILE, SHARED_RCC_FILE, SVG_PATH, BUTTONS_NT_PATH,
+                           BUTTONS_DARWIN_PATH, MAIN_SCSS_FILEPATH, STYLES_SCSS_FILEPATH, QSS_PATH,
+                           VARIABLES_SCSS_FILE)
 from qrainbowstyle.extras import OutputLogger, qt_message_handler
-from qrainbowstyle.utils.images import create_images, create_palette_image, generate_qrc_file, create_titlebar_images
-from qrainbowstyle.utils.scss import create_qss
+from qrainbowstyle.registry import find_palette, get_palettes
+from qrainbowstyle.utils.images import (create_images, create_palette_image, generate_qrc_file, create_titlebar_images,
+                                        create_shared_images, prune_shared_images, generate_shared_qrc_file,
+                                        get_image_work_items, render_images, _init_image_worker)
+from qrainbowstyle.utils.icons import _get_nt_button_color_map, _get_state_color_map
+from qrainbowstyle.utils.resources import create_rcc_file
+from qrainbowstyle.utils.scss import compile_qss_string, create_qss, create_qss_template
 
 from qtpy.QtCore import qInstallMessageHandler
 
+# Input hashes of previous build, stored in every style directory
+BUILD_MANIFEST_FILE = '.build_manifest.json'
 
-class QSSFileHandler(FileSystemEventHandler):
-    """QSS File observer."""
+BUILD_STAGES = ("palette_image", "images", "qss", "resources")
 
-    def __init__(self, parser_args):
-        """QSS File observer."""
-        super(QSSFileHandler, self).__init__()
-        self.args = parser_args
+PALETTE_FILEPATH = os.path.join(PACKAGE_PATH, 'palette.py')
 
-    def on_modified(self, event):
-        """Handle file system events."""
-        if event.src_path.endswith('.qss'):
-            run_process(self.args)
-            logging.debug('\n')
+# Seconds without file events after which changed styles are rebuilt
+DEBOUNCE_INTERVAL = 0.5
 
 
-def run_process(args):
-    """Process qrc files."""
+def get_rebuild_targets(path):
+    """Return build stages depending on changed file.
 
-    import inspect
-    import qrainbowstyle.palette as source
+    Outputs of the build (style directories, shared resources, generated
+    SCSS variables) and unrelated files are not build inputs.
 
-    palettes = []
-    for name, obj in inspect.getmembers(source):
-        if inspect.isclass(obj) and issubclass(obj, source.BasePalette) and obj is not source.BasePalette:
-            palettes.append(obj)
+    Args:
+        path (str): Path of changed file.
 
-    logging.debug("Found palettes: " + str(palettes))
+    Returns:
+        set: names of stages to rebuild or None if file is not a build input.
+    """
+    path = os.path.abspath(path)
+    name = os.path.basename(path)
+
+    if (path.startswith(STYLES_PATH + os.sep) or path.startswith(SHARED_RC_PATH + os.sep)
+            or '__pycache__' in path or name in (VARIABLES_SCSS_FILE, BUILD_MANIFEST_FILE)):
+        return None
 
-    for palette in palettes:
-        palette_name = str(palette.__name__)
-        logging.debug("Generating files for: " + palette_name)
+    if path == PALETTE_FILEPATH:
+        # palettes which colors changed are found by comparing hashes
+        return set(BUILD_STAGES)
+    if path.startswith(SVG_PATH + os.sep) and name.endswith('.svg'):
+        if name == 'base_palette.svg':
+            return {"palette_image"}
+        return {"images", "resources"}
+    if path.startswith(QSS_PATH + os.sep) and name.endswith('.scss'):
+        return {"qss", "resources"}
+    return None
 
-        # create directory for every style in palette.py
-        os.chdir(STYLES_PATH)
-        os.makedirs(palette_name, exist_ok=True)
-        os.chdir(os.path.join(STYLES_PATH, palette_name))
-        open("__init__.py", "w+").close()
 
-        output_dir = os.path.join(STYLES_PATH, palette_name)
+class BuildWorker(threading.Thread):
+    """Rebuild styles after changes of build inputs.
 
-        # get paths to output directories for this palette
-        images_dir = os.path.join(output_dir, 'images')
-        rc_dir = os.path.join(output_dir, 'rc')
-        # qss_dir = os.path.join(output_dir, 'qss')
+    Changed files are queued from observer thread. Bursts of events are
+    collected until no event comes for debounce interval, then only stages
+    depending on changed files are rebuilt.
+    """
 
-        # create directories
-        os.makedirs(images_dir, exist_ok=True)
-        os.makedirs(rc_dir, exist_ok=True)
-        # os.makedirs(qss_dir, exist_ok=True)
+    def __init__(self, parser_args, debounce=DEBOUNCE_INTERVAL):
+        super(BuildWorker, self).__init__(name="BuildWorker", daemon=True)
+        self.args = parser_args
+        self.debounce = debounce
+        self.queue = queue.Queue()
+
+    def schedule(self, path):
+        """Queue changed file."""
+        self.queue.put(path)
+
+    def stop(self):
+        """Stop worker after pending build."""
+        self.queue.put(None)
+
+    def run(self):
+        """Collect changed files and rebuild styles."""
+        while True:
+            path = self.queue.get()
+            if path is None:
+                return
+
+            paths = {path}
+            stopped = False
+            while True:
+                try:
+                    path = self.queue.get(timeout=self.debounce)
+                except queue.Empty:
+                    break
+                if path is None:
+                    stopped = True
+                    break
+                paths.add(path)
+
+            self.build(paths)
+            if stopped:
+                return
+
+    def build(self, paths):
+        """Rebuild stages depending on changed files."""
+        stages = set()
+        for path in paths:
+            stages.update(get_rebuild_targets(path) or ())
+        if not stages:
+            return
+
+        logging.debug("Changed files: " + ", ".join(sorted(paths)))
+        logging.debug("Rebuilding stages: " + ", ".join(sorted(stages)))
+        try:
+            if PALETTE_FILEPATH in paths:
+                import qrainbowstyle.palette
+                importlib.reload(qrainbowstyle.palette)
+            run_process(self.args, stages=stages)
+        except Exception:
+            logging.exception("Build failed")
+        logging.debug('\n')
+
+
+class QSSFileHandler(FileSystemEventHandler):
+    """Build inputs observer, changes are passed to build worker."""
+
+    def __init__(self, worker):
+        """Build inputs observer."""
+        super(QSSFileHandler, self).__init__()
+        self.worker = worker
+
+    def on_any_event(self, event):
+        """Handle file system events."""
+        if event.is_directory or event.event_type not in ('created', 'modified', 'moved'):
+            return
+        path = getattr(event, 'dest_path', None) or event.src_path
+        if get_rebuild_targets(path) is not None:
+            self.worker.schedule(os.path.abspath(path))
+
+
+def compile_rcc(qrc_file, rcc_file, compiled_files=()):
+    """Compile qrc file to binary resources file.
+
+    If rcc is not installed, binary resources are created from the first
+    existing compiled _rc.py module or from a temporary pyrcc5 output.
+    """
+    try:
+        call(['rcc', '-binary', qrc_file, '-o', rcc_file])
+        return
+    except FileNotFoundError:
+        pass
+
+    compiled = [f for f in compiled_files if os.path.isfile(f)]
+    if compiled:
+        logging.debug("rcc not found, creating binary resources from " + os.path.basename(compiled[0]))
+        create_rcc_file(compiled[0], rcc_file)
+        return
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        py_file = os.path.join(temp_dir, 'resources_rc.py')
+        call(['pyrcc5', qrc_file, '-o', py_file])
+        create_rcc_file(py_file, rcc_file)
+    except FileNotFoundError:
+        logging.debug("You must install rcc or pyrcc5")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def compile_resources(qrc_file, palette, create):
+    """Compile qrc file for bindings chosen by create option and to binary resources.
+
+    Resource compilers of all bindings run concurrently. Binary resources
+    are always created, load_stylesheet prefers them.
+    """
+    output_dir = os.path.dirname(qrc_file)
+    filename = os.path.splitext(os.path.basename(qrc_file))[0]
+    ext = '_rc.py'
+    ext_c = '.rcc'
+
+    # creating names
+    py_file_pyqt5 = os.path.join(output_dir, 'pyqt5_' + filename + ext)
+    py_file_pyside2 = os.path.join(output_dir, 'pyside2_' + filename + ext)
+    py_file_pyside6 = os.path.join(output_dir, 'pyside6_' + filename + ext)
+    py_file_qtpy = os.path.join(output_dir, filename + ext)
+    rcc_file = os.path.join(output_dir, filename + ext_c)
+
+    # append palette used to generate this file
+    used_palette = "\nfrom " + palette.__module__ + " import " + palette.__name__ + "\npalette = " + palette.__name__ + "\n"
+
+    commands = []
+    if create in ['pyqt5', 'qtpy', 'all']:
+        commands.append(('PyQt5', ['pyrcc5', qrc_file, '-o', py_file_pyqt5], py_file_pyqt5))
+    if create in ['pyside2', 'all']:
+        commands.append(('PySide 2', ['pyside2-rcc', '-py3', qrc_file, '-o', py_file_pyside2], py_file_pyside2))
+    if create in ['pyside6', 'all']:
+        commands.append(('PySide 6', ['pyside6-rcc', '-py3', qrc_file, '-o', py_file_pyside6], py_file_pyside6))
+
+    # calling external commands
+    processes = []
+    for name, command, py_file in commands:
+        logging.debug("Compiling for {} ...".format(name))
+        try:
+            processes.append((py_file, Popen(command)))
+        except FileNotFoundError:
+            logging.debug("You must install " + command[0])
+
+    logging.debug("Compiling binary resources ...")
+    try:
+        rcc_process = Popen(['rcc', '-binary', qrc_file, '-o', rcc_file])
+    except FileNotFoundError:
+        rcc_process = None
+
+    for py_file, process in processes:
+        if process.wait() == 0:
+            with open(py_file, "a+") as f:
+                f.write(used_palette)
+
+    if create in ['qtpy', 'all'] and os.path.isfile(py_file_pyqt5):
+        logging.debug("Compiling for QtPy ...")
+        # special case - qtpy - syntax is PyQt5
+        with open(py_file_pyqt5, 'r') as file:
+            filedata = file.read()
+
+        # replace the target string
+        filedata = filedata.replace('from PyQt5', 'from qtpy')
+
+        with open(py_file_qtpy, 'w+') as file:
+            # write the file out again
+            file.write(filedata)
+
+        if create not in ['pyqt5']:
+            os.remove(py_file_pyqt5)
+
+    if rcc_process is not None:
+        rcc_process.wait()
+    else:
+        compile_rcc(qrc_file, rcc_file, (py_file_qtpy, py_file_pyqt5, py_file_pyside2, py_file_pyside6))
 
-        qrc_filepath = os.path.join(output_dir, QRC_FILE)
-        qss_filepath = os.path.join(output_dir, QSS_FILE)
-        # variables_scss_filepath = os.path.join(qss_dir, VARIABLES_SCSS_FILE)
 
-        # Create palette and resources png images
+def create_shared_resources(manifests):
+    """Remove unused shared images and compile shared resources."""
+    logging.debug("Generating shared resources ...")
+    prune_shared_images(manifests)
+    generate_shared_qrc_file()
+    compile_rcc(os.path.join(SHARED_RC_PATH, SHARED_QRC_FILE), os.path.join(SHARED_RC_PATH, SHARED_RCC_FILE))
+
+
+class BuildManifest:
+    """Input hashes of build stages of one palette.
+
+    A stage is skipped when hash of its inputs is the same as in the
+    previous build and all its outputs exist.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'r') as fh:
+                self.stages = json.load(fh)
+        except (OSError, ValueError):
+            self.stages = {}
+
+    def is_current(self, stage, key, *outputs):
+        """Return True if stage was built from the same inputs and its outputs exist."""
+        return self.stages.get(stage) == key and all(os.path.exists(output) for output in outputs)
+
+    def update(self, stage, key):
+        """Record inputs of built stage."""
+        self.stages[stage] = key
+        with open(self.path, 'w') as fh:
+            json.dump(self.stages, fh, indent=2, sort_keys=True)
+
+
+def _hash(*parts):
+    """Return hash of json serializable parts."""
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def _hash_files(paths):
+    """Return hash of file names and contents."""
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()
+
+
+def get_source_hashes():
+    """Return hashes of build inputs shared by all palettes."""
+    from qtpy import API_NAME, PYQT_VERSION, PYSIDE_VERSION, QT_VERSION
+
+    return {
+        "base_palette": _hash_files([os.path.join(SVG_PATH, 'base_palette.svg')]),
+        "svg": _hash_files(glob.glob(os.path.join(SVG_PATH, '*.svg'))
+                           + glob.glob(os.path.join(BUTTONS_NT_PATH, '*.svg'))
+                           + glob.glob(os.path.join(BUTTONS_DARWIN_PATH, '*.svg'))),
+        "scss": _hash_files([MAIN_SCSS_FILEPATH, STYLES_SCSS_FILEPATH]),
+        "versions": [qrainbowstyle.__version__, API_NAME, PYQT_VERSION, PYSIDE_VERSION, QT_VERSION, qtsass.__version__],
+    }
+
+
+def get_stage_keys(palette, sources, args):
+    """Return input hashes of build stages of palette."""
+    versions = sources["versions"]
+    keys = {
+        "palette_image": _hash(palette.color_palette(), sources["base_palette"], versions),
+        "images": _hash(_get_state_color_map(palette), _get_nt_button_color_map(palette),
+                        sources["svg"], args.shared_rc, versions),
+        "qss": _hash(palette.to_dict(), sources["scss"], versions),
+    }
+    keys["resources"] = _hash(keys["images"], keys["qss"], args.create, versions)
+    return keys
+
+
+def get_stale_stages(palette, sources, args, stages=None):
+    """Return build manifest of palette and names of its stages which must be rebuilt.
+
+    Args:
+        palette (BasePalette): Palette class.
+        sources (dict): Hashes from get_source_hashes().
+        args (argparse.Namespace): Parsed command line arguments.
+        stages (set): Names of stages which are checked, other stages are
+            considered up to date. Defaults to all stages.
+
+    Returns:
+        tuple: BuildManifest, stage keys and set of stale stage names.
+    """
+    output_dir = os.path.join(STYLES_PATH, palette.__name__)
+    build_manifest = BuildManifest(os.path.join(output_dir, BUILD_MANIFEST_FILE))
+    if args.force:
+        build_manifest.stages = {}
+    keys = get_stage_keys(palette, sources, args)
+
+    outputs = {
+        "palette_image": os.path.join(output_dir, 'images', 'palette.png'),
+        "images": os.path.join(output_dir, RC_MANIFEST_FILE if args.shared_rc else 'rc'),
+        "qss": os.path.join(output_dir, QSS_FILE),
+        "resources": os.path.join(output_dir, RCC_FILE),
+    }
+    stale = set()
+    for stage in BUILD_STAGES:
+        if stages is not None and stage not in stages:
+            continue
+        if not build_manifest.is_current(stage, keys[stage], outputs[stage]):
+            stale.add(stage)
+
+    return build_manifest, keys, stale
+
+
+def build_palette(palette_name, sources, args, stages=None, prerendered=False, isolated=False):
+    """Build stale stages of one palette.
+
+    Only absolute paths are used, working directory is not changed, so
+    palettes can be built in worker processes.
+
+    Args:
+        palette_name (str): Name of palette class.
+        sources (dict): Hashes from get_source_hashes().
+        args (argparse.Namespace): Parsed command line arguments.
+        stages (set): Names of stages which are checked and rebuilt,
+            other stages are considered up to date. Defaults to all stages.
+        prerendered (bool): Icons of palette were already rendered.
+        isolated (bool): Compile SCSS in memory without writing variables file.
+
+    Returns:
+        dict: palette name, shared resources manifest (or None), whether
+            shared images changed and seconds spent in every stage.
+    """
+    palette = find_palette(palette_name)
+    build_manifest, keys, stale = get_stale_stages(palette, sources, args, stages)
+    result = {"palette": palette_name, "manifest": None, "shared_changed": False, "timings": {}}
+
+    output_dir = os.path.join(STYLES_PATH, palette_name)
+    manifest_filepath = os.path.join(output_dir, RC_MANIFEST_FILE)
+
+    if not stale:
+        logging.debug("Skipping unchanged palette: " + palette_name)
+        if args.shared_rc:
+            with open(manifest_filepath, 'r') as fh:
+                result["manifest"] = json.load(fh)
+        return result
+
+    logging.debug("Generating files for: " + palette_name)
+
+    # create directory for every style in palette.py
+    os.makedirs(output_dir, exist_ok=True)
+    open(os.path.join(output_dir, "__init__.py"), "w+").close()
+
+    # get paths to output directories for this palette
+    images_dir = os.path.join(output_dir, 'images')
+    rc_dir = os.path.join(output_dir, 'rc')
+
+    # create directories
+    os.makedirs(images_dir, exist_ok=True)
+    os.makedirs(rc_dir, exist_ok=True)
+
+    qrc_filepath = os.path.join(output_dir, QRC_FILE)
+    qss_filepath = os.path.join(output_dir, QSS_FILE)
+
+    timings = result["timings"]
+
+    # Create palette and resources png images
+    if "palette_image" in stale:
         logging.debug('Generating palette image ...')
+        start = time.perf_counter()
         create_palette_image(palette=palette, path=images_dir)
+        build_manifest.update("palette_image", keys["palette_image"])
+        timings["palette_image"] = time.perf_counter() - start
+    else:
+        logging.debug('Palette image is up to date')
 
-        logging.debug('Generating images ...')
-        create_images(palette=palette, rc_path=rc_dir)
+    if "images" in stale:
+        start = time.perf_counter()
+        if not prerendered:
+            logging.debug('Generating images ...')
+            create_images(palette=palette, rc_path=rc_dir)
 
         logging.debug("Generating images for titlebar buttons")
         create_titlebar_images(rc_path=rc_dir, palette=palette)
 
+        if args.shared_rc:
+            logging.debug('Moving images to shared resources ...')
+            result["manifest"] = create_shared_images(rc_path=rc_dir, manifest_path=manifest_filepath)
+            # style resources contain only the stylesheet
+            shutil.rmtree(rc_dir)
+            os.makedirs(rc_dir)
+            result["shared_changed"] = True
+        elif os.path.isfile(manifest_filepath):
+            os.remove(manifest_filepath)
+
         logging.debug('Generating qrc ...')
         generate_qrc_file(rc_path=rc_dir, qrc_path=qrc_filepath)
+        build_manifest.update("images", keys["images"])
+        timings["images"] = time.perf_counter() - start
+    else:
+        logging.debug('Images are up to date')
+        if args.shared_rc:
+            with open(manifest_filepath, 'r') as fh:
+                result["manifest"] = json.load(fh)
+
+    # Create variables SCSS files and compile SCSS files to QSS
+    if "qss" in stale:
+        logging.debug('Compiling SCSS/SASS files to QSS ...')
+        start = time.perf_counter()
+        if isolated:
+            # generated _variables.scss is not shared between workers
+            with open(qss_filepath, 'w') as fh:
+                fh.write(compile_qss_string(palette))
+        else:
+            create_qss(palette=palette, qss_filepath=qss_filepath)
+        build_manifest.update("qss", keys["qss"])
+        timings["qss"] = time.perf_counter() - start
+    else:
+        logging.debug('QSS is up to date')
 
+    if "resources" in stale:
         logging.debug('Converting .qrc to _rc.py and/or .rcc ...')
+        start = time.perf_counter()
+        compile_resources(qrc_filepath, palette, args.create)
+        build_manifest.update("resources", keys["resources"])
+        timings["resources"] = time.perf_counter() - start
+    else:
+        logging.debug('Compiled resources are up to date')
 
-        for qrc_file in glob.glob('*.qrc'):
-            # get name without extension
-            filename = os.path.splitext(qrc_file)[0]
+    return result
 
-            logging.debug(filename + '...')
-            ext = '_rc.py'
-            ext_c = '.rcc'
 
-            # Create variables SCSS files and compile SCSS files to QSS
-            logging.debug('Compiling SCSS/SASS files to QSS ...')
-            create_qss(palette=palette, qss_filepath=qss_filepath)
+def _init_build_worker():
+    """Initialize logging and offscreen QGuiApplication of worker process."""
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s [%(processName)s] [%(levelname)s] %(message)s')
+    _init_image_worker()
 
-            # creating names
-            py_file_pyqt5 = 'pyqt5_' + filename + ext
-            py_file_pyside2 = 'pyside2_' + filename + ext
-            py_file_pyside6 = 'pyside6_' + filename + ext
-            py_file_qtpy = '' + filename + ext
 
-            # append palette used to generate this file
-            used_palette = "\nfrom qrainbowstyle.palette import " + palette.__name__ + "\npalette = " + palette.__name__ + "\n"
+def format_timings(results, total):
+    """Return table of seconds spent in every stage of every palette."""
+    header = ["Palette"] + list(BUILD_STAGES) + ["Total"]
+    rows = []
+    for result in results:
+        timings = result["timings"]
+        row = [result["palette"]]
+        row.extend("{:.2f}".format(timings[stage]) if stage in timings else "-" for stage in BUILD_STAGES)
+        row.append("{:.2f}".format(sum(timings.values())))
+        rows.append(row)
+    rows.append(["Wall time"] + [""] * len(BUILD_STAGES) + ["{:.2f}".format(total)])
 
-            # calling external commands
-            if args.create in ['pyqt5', 'qtpy', 'all']:
-                logging.debug("Compiling for PyQt5 ...")
-                try:
-                    call(['pyrcc5', qrc_file, '-o', py_file_pyqt5])
-                    with open(py_file_pyqt5, "a+") as f:
-                        f.write(used_palette)
-                except FileNotFoundError:
-                    logging.debug("You must install pyrcc5")
-
-            if args.create in ['pyside2', 'all']:
-                logging.debug("Compiling for PySide 2...")
-                try:
-                    call(['pyside2-rcc', '-py3', qrc_file, '-o', py_file_pyside2])
-                    with open(py_file_pyside2, "a+") as f:
-                        f.write(used_palette)
-                except FileNotFoundError:
-                    logging.debug("You must install pyside2-rcc")
-
-            if args.create in ['pyside6', 'all']:
-                logging.debug("Compiling for PySide 6...")
-                try:
-                    call(['pyside6-rcc', '-py3', qrc_file, '-o', py_file_pyside6])
-                    with open(py_file_pyside6, "a+") as f:
-                        f.write(used_palette)
-                except FileNotFoundError:
-                    logging.debug("You must install pyside6-rcc")
+    widths = [max(len(row[column]) for row in [header] + rows) for column in range(len(header))]
+    lines = []
+    for row in [header] + rows:
+        lines.append("  ".join(cell.ljust(width) if not column else cell.rjust(width)
+                               for column, (cell, width) in enumerate(zip(row, widths))))
+    lines.insert(1, "-" * len(lines[0]))
+    return "\n".join(lines)
 
-            if args.create in ['qtpy', 'all']:
-                logging.debug("Compiling for QtPy ...")
-                # special case - qtpy - syntax is PyQt5
-                with open(py_file_pyqt5, 'r') as file:
-                    filedata = file.read()
 
-                # replace the target string
-                filedata = filedata.replace('from PyQt5', 'from qtpy')
+def run_process(args, stages=None):
+    """Process qrc files.
 
-                with open(py_file_qtpy, 'w+') as file:
-                    # write the file out again
-                    file.write(filedata)
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        stages (set): Names of stages which are checked and rebuilt,
+            other stages are considered up to date. Defaults to all stages.
+    """
 
-                if args.create not in ['pyqt5']:
-                    os.remove(py_file_pyqt5)
+    palettes = get_palettes()
+
+    logging.debug("Found palettes: " + str(palettes))
+
+    start = time.perf_counter()
+    sources = get_source_hashes()
+
+    # palette independent stylesheet template, rendered at runtime without qtsass
+    if stages is None or "qss" in stages:
+        create_qss_template(force=args.force)
+
+    if args.parallel:
+        # every palette is built in its own worker process, spawn, Qt does not survive fork
+        jobs = args.jobs if args.jobs > 1 else os.cpu_count() or 1
+        logging.debug('Building {} palettes with {} jobs ...'.format(len(palettes), jobs))
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(jobs, mp_context=context, initializer=_init_build_worker) as executor:
+            futures = [executor.submit(build_palette, palette.__name__, sources, args, stages, False, True)
+                       for palette in palettes]
+            results = [future.result() for future in futures]
+    else:
+        prerendered = []
+        if args.jobs > 1:
+            # render images of all changed palettes at once in process pool
+            items = []
+            for palette in palettes:
+                if "images" in get_stale_stages(palette, sources, args, stages)[2]:
+                    rc_dir = os.path.join(STYLES_PATH, palette.__name__, 'rc')
+                    os.makedirs(rc_dir, exist_ok=True)
+                    items.extend(get_image_work_items(palette=palette, rc_path=rc_dir))
+                    prerendered.append(palette)
+            if items:
+                logging.debug('Generating images of {} palettes with {} jobs ...'.format(len(prerendered), args.jobs))
+                render_images(items, jobs=args.jobs)
+
+        results = [build_palette(palette.__name__, sources, args, stages, palette in prerendered)
+                   for palette in palettes]
+
+    shared_rcc_filepath = os.path.join(SHARED_RC_PATH, SHARED_RCC_FILE)
+    shared_changed = any(result["shared_changed"] for result in results)
+    if args.shared_rc and (shared_changed or not os.path.isfile(shared_rcc_filepath)):
+        create_shared_resources([result["manifest"] for result in results])
+
+    logging.info("Build times in seconds:\n" + format_timings(results, time.perf_counter() - start))
 
 
 def main(arguments):
@@ -190,23 +632,44 @@ def main(arguments):
                         choices=['pyqt5', 'pyside2', 'pyside6', 'qtpy', 'qt5', 'all'],
                         type=str,
                         help="Choose which one would be generated.")
+    parser.add_argument('--jobs', '-j',
+                        default=1,
+                        type=int,
+                        help="Number of processes rendering images.")
+    parser.add_argument('--parallel', '-p',
+                        action='store_true',
+                        help="Build every palette in its own worker process, "
+                             "number of processes is set by --jobs (defaults to CPU count).")
+    parser.add_argument('--force', '-f',
+                        action='store_true',
+                        help="Rebuild all stages even if their inputs did not change.")
+    parser.add_argument('--shared_rc',
+                        action='store_true',
+                        help="Store png images of all styles once in shared resources.")
     parser.add_argument('--watch', '-w',
                         action='store_true',
-                        help="Watch for file changes.")
+                        help="Watch for changes of palette, SCSS and svg files and rebuild affected stages.")
 
     args = parser.parse_args(arguments)
 
     if args.watch:
         path = PACKAGE_PATH
+        worker = BuildWorker(parser_args=args)
+        worker.start()
         observer = Observer()
-        handler = QSSFileHandler(parser_args=args)
+        handler = QSSFileHandler(worker=worker)
         observer.schedule(handler, path, recursive=True)
+        observer.start()
+        logging.debug('Watching palette, SCSS and svg files for changes...Press Ctrl+C to exit')
         try:
-            logging.debug('Watching QSS file for changes...Press Ctrl+C to exit')
-            observer.start()
+            while observer.is_alive():
+                time.sleep(1)
         except KeyboardInterrupt:
-            observer.stop()
+            pass
+        observer.stop()
         observer.join()
+        worker.stop()
+        worker.join()
     else:
         run_process(args)
 
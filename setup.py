@@ -9,6 +9,7 @@ import os
 import sys
 import glob
 from setuptools import find_packages, setup
+from setuptools.command.build_py import build_py
 
 # Package imports
 from qrainbowstyle import __doc__ as long_desc
@@ -38,10 +39,34 @@ def remove_all(dir_path, patterns='*.pyc'):
             os.remove(filename)
 
 
+class BuildPy(build_py):
+    """Build package with binary resources of styles instead of resource modules.
+
+    Styles keep their resources in style_rc.py modules in the source tree.
+    Every module is converted to style.rcc in the build directory and is not
+    installed, so resources of a style are shipped once.
+    """
+
+    def run(self):
+        super().run()
+
+        from qrainbowstyle import RCC_FILE
+        from qrainbowstyle.utils.resources import RESOURCE_MODULE, create_rcc_file
+
+        pattern = os.path.join(self.build_lib, 'qrainbowstyle', 'styles', '*', RESOURCE_MODULE + '.py')
+        for module_filepath in glob.glob(pattern):
+            create_rcc_file(module_filepath, os.path.join(os.path.dirname(module_filepath), RCC_FILE))
+            os.remove(module_filepath)
+
+
 setup(
     name='qrainbowstyle',
     version=__version__,
     packages=find_packages(),
+    package_data={'qrainbowstyle': ['rc_shared/shared.rcc', 'qss/style_template.json',
+                                    'svg/*.svg', 'svg/buttons_nt/*.svg', 'svg/buttons_darwin/*.svg'],
+                  'qrainbowstyle.styles': ['*/rc_manifest.json']},
+    cmdclass={'build_py': BuildPy},
     url='https://github.com/desty2k/QRainbowStyleSheet',
     license='MIT',
     author='Wojciech Wentland',
@@ -58,15 +83,13 @@ setup(
         'Operating System :: Microsoft :: Windows',
         'Operating System :: POSIX :: Linux',
         'Operating System :: MacOS',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
         'Programming Language :: Python :: 3.10',
         'Topic :: Software Development :: Libraries :: Application Frameworks'
     ],
-    python_requires='>=3.5',
+    python_requires='>=3.7',
     zip_safe=False,  # don't use eggs
     entry_points={"console_scripts": ["qrainbowstyle=qrainbowstyle.__main__:main"]},
     extras_require=extras_require,
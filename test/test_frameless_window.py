@@ -0,0 +1,242 @@
+#!python
+# -*- coding: utf-8 -*-
+"""Test frameless window for Linux and Darwin."""
+
+# Standard library imports
+import importlib
+import os
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Third party imports
+from qtpy.QtCore import QEvent, QObject, QPoint, QPointF, QRect, QSize, Qt
+from qtpy.QtGui import QMouseEvent
+from qtpy.QtWidgets import QApplication, QRubberBand, QTableWidget, QWidget
+
+# Local imports
+import qrainbowstyle
+from qrainbowstyle.windows.FramelessWindow import FramelessWindow
+from qrainbowstyle.windows.base import Grips
+from qrainbowstyle.windows.base.Grips import EdgeGrip
+from qrainbowstyle.windows.base.Screens import getScreenCache
+
+# module is shadowed by class of same name in qrainbowstyle.windows
+FramelessWindowModule = importlib.import_module("qrainbowstyle.windows.FramelessWindow")
+
+app = QApplication.instance() or QApplication([])
+
+# Budget of event filter in microseconds per mouse move, generous so slow machines pass
+MOUSE_MOVE_BUDGET = 500
+
+
+def _mouse_move(x, y, buttons=Qt.NoButton):
+    return QMouseEvent(QEvent.MouseMove, QPointF(x, y), Qt.NoButton, buttons, Qt.NoModifier)
+
+
+def _drag(widget, start, end, steps=1, delay=0.0):
+    """Send press, moves and release of left button to widget, positions are global.
+
+    Events are processed for delay seconds after each mouse event.
+    """
+    events = [(QEvent.MouseButtonPress, start, Qt.LeftButton, Qt.LeftButton)]
+    events += [(QEvent.MouseMove, start + (end - start) * (i / steps), Qt.NoButton, Qt.LeftButton)
+               for i in range(1, steps + 1)]
+    events.append((QEvent.MouseButtonRelease, end, Qt.LeftButton, Qt.NoButton))
+    for event_type, pos, button, buttons in events:
+        local = QPointF(widget.mapFromGlobal(pos))
+        QApplication.sendEvent(widget, QMouseEvent(event_type, local, local, QPointF(pos),
+                                                   button, buttons, Qt.NoModifier))
+        app.processEvents()
+        deadline = time.perf_counter() + delay
+        while time.perf_counter() < deadline:
+            app.processEvents()
+
+
+class GeometryCounter(QObject):
+    """Count move and resize events of watched window."""
+
+    def __init__(self, window):
+        super(GeometryCounter, self).__init__()
+        self.moves = 0
+        self.resizes = 0
+        self.resizeTimes = []
+        window.installEventFilter(self)
+
+    def eventFilter(self, widget, event):
+        if event.type() == QEvent.Move:
+            self.moves += 1
+        elif event.type() == QEvent.Resize:
+            self.resizes += 1
+            self.resizeTimes.append(time.perf_counter())
+        return False
+
+
+def _create_window(width=800, height=600, **kwargs):
+    win = FramelessWindow(**kwargs)
+    win.addContentWidget(QTableWidget(50, 20))
+    win.resize(width, height)
+    win.show()
+    app.processEvents()
+    return win
+
+
+def _tracked_widgets(win):
+    return [widget for widget in [win] + win.findChildren(QWidget) if widget.hasMouseTracking()]
+
+
+def test_grips_follow_resize():
+    win = _create_window()
+
+    win.eventFilter(win, _mouse_move(798, 598))
+    assert win.cursor().shape() == Qt.SizeFDiagCursor
+
+    # grips are recomputed on resize event
+    win.resize(600, 400)
+    app.processEvents()
+    win.eventFilter(win, _mouse_move(798, 598))
+    assert win.cursor().shape() == Qt.ArrowCursor
+    win.eventFilter(win, _mouse_move(598, 398))
+    assert win.cursor().shape() == Qt.SizeFDiagCursor
+    win.close()
+
+
+def test_resize_grips():
+    app.setStyleSheet(qrainbowstyle.load_stylesheet())
+    win = FramelessWindow(resizeMode=FramelessWindow.ResizeGrips)
+    assert win.resizeMode() == FramelessWindow.ResizeGrips
+    win.addContentWidget(QTableWidget(50, 20))
+    win.resize(800, 600)
+    win.show()
+    app.processEvents()
+
+    # after polish only widgets matching hover rules of stylesheet are tracked, window adds none
+    tracked = _tracked_widgets(win)
+    assert all(widget.testAttribute(Qt.WA_Hover) for widget in tracked)
+    assert not any(isinstance(widget, EdgeGrip) for widget in tracked)
+    app.setStyleSheet(qrainbowstyle.load_stylesheet(style='oceanic'))
+    app.processEvents()
+    assert not any(grip.hasMouseTracking() for grip in win.findChildren(EdgeGrip))
+    reference = _create_window()
+    assert len(tracked) < len(_tracked_widgets(reference))
+    reference.close()
+
+    grip = next(grip for grip in win.findChildren(EdgeGrip) if grip.edges == Qt.BottomEdge | Qt.RightEdge)
+    assert grip.isVisible()
+    assert grip.geometry().bottomRight() == win.rect().bottomRight()
+
+    corner = win.mapToGlobal(win.rect().bottomRight())
+    _drag(grip, corner, corner + QPoint(-100, 50))
+    app.processEvents()
+    assert win.size() == QSize(700, 650)
+    # grips are placed again on new window edges
+    assert grip.geometry().bottomRight() == win.rect().bottomRight()
+
+    win.setResizingEnabled(False)
+    assert not grip.isVisible()
+
+    win.setResizeMode(FramelessWindow.ResizeTracking)
+    assert win.findChild(QTableWidget).hasMouseTracking()
+    win.close()
+
+
+def test_system_resize(monkeypatch):
+    steps = 10
+    win = _create_window(resizeMode=FramelessWindow.ResizeSystem)
+    grip = next(grip for grip in win.findChildren(EdgeGrip) if grip.edges == Qt.BottomEdge | Qt.RightEdge)
+    corner = win.mapToGlobal(win.rect().bottomRight())
+
+    # offscreen platform refuses system resize, grip resizes window itself
+    counter = GeometryCounter(win)
+    _drag(grip, corner, corner + QPoint(-100, 50), steps)
+    assert win.size() == QSize(700, 650)
+    assert counter.resizes == steps
+
+    # titlebar moves window itself too, cursor is moved in small steps to stay over titlebar
+    counter = GeometryCounter(win)
+    title = win.titlebar().mapToGlobal(win.titlebar().rect().center())
+    _drag(win, title, title + QPoint(20, 20), steps)
+    assert counter.moves == steps
+
+    # when window manager accepts it, window geometry is not changed by drag events
+    monkeypatch.setattr(Grips, "startSystemResize", lambda window, edges: True)
+    monkeypatch.setattr(FramelessWindowModule, "startSystemMove", lambda window: True)
+    counter = GeometryCounter(win)
+    _drag(grip, corner, corner + QPoint(100, 100), steps)
+    title = win.titlebar().mapToGlobal(win.titlebar().rect().center())
+    _drag(win, title, title + QPoint(20, 20), steps)
+    assert (counter.moves, counter.resizes) == (0, 0)
+    assert win.size() == QSize(700, 650)
+    win.close()
+
+
+def test_resize_throttling():
+    steps = 10
+    win = _create_window(resizeMode=FramelessWindow.ResizeGrips)
+    win.setResizeThrottling(True)
+    grip = next(grip for grip in win.findChildren(EdgeGrip) if grip.edges == Qt.BottomEdge | Qt.RightEdge)
+    corner = win.mapToGlobal(win.rect().bottomRight())
+    frame = 1 / (win.screen().refreshRate() or 60)
+
+    # moves come about four times per frame, geometry is applied at most once per frame
+    counter = GeometryCounter(win)
+    _drag(grip, corner, corner + QPoint(-100, 50), 40, delay=frame / 4)
+    assert win.size() == QSize(700, 650)
+    # last geometry is applied on release, regardless of frame timer
+    gaps = [b - a for a, b in zip(counter.resizeTimes, counter.resizeTimes[1:-1])]
+    assert gaps and min(gaps) > frame * 0.8
+    assert 2 < counter.resizes <= (counter.resizeTimes[-1] - counter.resizeTimes[0]) / frame + 2
+
+    # window is resized only on release, legacy resizing uses same throttle
+    win.setResizeOutline(True)
+    win.setResizeMode(FramelessWindow.ResizeTracking)
+    counter = GeometryCounter(win)
+    corner = win.mapToGlobal(win.rect().bottomRight())
+    _drag(win, corner, corner + QPoint(100, 50), steps)
+    assert counter.resizes == 1
+    # legacy resizing sets window size to cursor position
+    assert win.size() == QSize(799, 699)
+    assert not any(band.isVisible() for band in app.topLevelWidgets() if isinstance(band, QRubberBand))
+    win.close()
+
+
+def test_snap_zones():
+    screens = getScreenCache()
+    geometry, available = screens.screenAt(QPoint(10, 10))
+    assert screens.screenAt(geometry.bottomRight() + QPoint(500, 0)) == (geometry, available)
+
+    half_width, half_height = available.width() // 2, available.height() // 2
+    left, right = geometry.left(), geometry.right()
+    middle = geometry.center().y()
+    assert screens.snapGeometry(QPoint(geometry.center().x(), geometry.top())) == (None, True)
+    assert screens.snapGeometry(geometry.center()) == (None, False)
+    assert screens.snapGeometry(QPoint(left, middle))[0] == QRect(available.left(), available.top(),
+                                                                  half_width, available.height())
+    assert screens.snapGeometry(QPoint(right, middle))[0].right() == available.right()
+    assert screens.snapGeometry(QPoint(left, geometry.top()))[0].size() == QSize(half_width, half_height)
+    assert screens.snapGeometry(QPoint(right, geometry.bottom()))[0].bottomRight() == available.bottomRight()
+
+    # dropping titlebar on screen edge snaps window
+    win = _create_window()
+    title = win.titlebar().mapToGlobal(win.titlebar().rect().center())
+    _drag(win, title, QPoint(left, middle), 40)
+    assert win.geometry() == screens.snapGeometry(QPoint(left, middle))[0]
+    win.close()
+
+
+def test_event_filter_benchmark():
+    win = _create_window()
+    moves = [_mouse_move(100 + i % 400, 200 + i % 300) for i in range(5000)]
+    others = [QEvent(QEvent.UpdateRequest) for _ in range(5000)]
+
+    timings = {}
+    for name, events in (("move", moves), ("other", others)):
+        start = time.perf_counter()
+        for event in events:
+            win.eventFilter(win, event)
+        timings[name] = (time.perf_counter() - start) / len(events) * 1e6
+
+    assert timings["move"] < MOUSE_MOVE_BUDGET
+    # uninteresting events are rejected before any other work
+    assert timings["other"] < timings["move"]
+    win.close()
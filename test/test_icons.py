@@ -0,0 +1,65 @@
+#!python
+# -*- coding: utf-8 -*-
+"""Test runtime rendering of palette colored icons."""
+
+# Standard library imports
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Third party imports
+from qtpy.QtCore import QFile
+from qtpy.QtGui import QImage
+from qtpy.QtWidgets import QApplication
+
+# Local imports
+from qrainbowstyle import STYLES_PATH
+from qrainbowstyle.palette import Oceanic
+from qrainbowstyle.utils.icons import IconProvider
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_image_cache():
+    provider = IconProvider(Oceanic)
+    first = provider.image('arrow_down', '_focus', ratio=1.5)
+    second = provider.image('arrow_down', '_focus', ratio=1.5)
+
+    assert first is second
+    assert first.width() == 48
+    assert provider.cacheInfo()['hits'] == 1
+    assert provider.cacheInfo()['misses'] == 1
+
+
+def test_register_icons():
+    provider = IconProvider(Oceanic)
+    path = provider.register(ratios=[2, 3])
+
+    # same files as in pre-rendered style resources
+    for fname in os.listdir(os.path.join(STYLES_PATH, 'Oceanic', 'rc')):
+        assert QFile(path + '/rc/' + fname).exists()
+
+    assert QImage(path + '/rc/checkbox_checked@3x.png').width() == 96
+    provider.unregister()
+    assert not QFile(path + '/rc/arrow_down.png').exists()
+
+
+def test_rebuild_after_svg_edit(tmp_path):
+    from qrainbowstyle.utils.images import _create_darwin_buttons
+
+    svg_dir, rc_dir = tmp_path / 'svg', tmp_path / 'rc'
+    svg_dir.mkdir()
+    rc_dir.mkdir()
+    svg_path = svg_dir / 'button_darwin_close.svg'
+    svg = '<svg xmlns="http://www.w3.org/2000/svg" width="32" height="32"><rect width="32" height="32" fill="{}"/></svg>'
+
+    # watch mode renders images again in the same process after svg is edited
+    svg_path.write_text(svg.format('#ff0000'))
+    _create_darwin_buttons(base_svg_path=str(svg_dir), rc_path=str(rc_dir))
+    assert QImage(str(rc_dir / 'button_darwin_close.png')).pixelColor(16, 16).name() == '#ff0000'
+
+    svg_path.write_text(svg.format('#0000ff'))
+    stat = os.stat(str(svg_path))
+    os.utime(str(svg_path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+    _create_darwin_buttons(base_svg_path=str(svg_dir), rc_path=str(rc_dir))
+    assert QImage(str(rc_dir / 'button_darwin_close.png')).pixelColor(16, 16).name() == '#0000ff'
@@ -0,0 +1,71 @@
+#!python
+# -*- coding: utf-8 -*-
+"""Test import time of qrainbowstyle."""
+
+# Standard library imports
+import os
+import re
+import subprocess
+import sys
+
+# Import of qrainbowstyle is measured against import of Qt bindings in the same run,
+# plain import does not load Qt, so it must be faster on any machine
+BASELINE_IMPORT = 'qtpy.QtCore'
+
+# Budget of self import time of qrainbowstyle modules in microseconds, standard
+# library modules imported by them are not included, about ten times measured time
+OWN_IMPORT_TIME_BUDGET = 10000
+
+# Every import is measured in this many fresh interpreters, the fastest one is used
+IMPORT_TIME_RUNS = 3
+
+# Modules which must not be imported by plain import of qrainbowstyle
+HEAVY_MODULES = ('qtpy', 'PyQt5', 'PySide2', 'PySide6', 'qtsass', 'inspect',
+                 'qrainbowstyle.palette', 'qrainbowstyle.utils', 'qrainbowstyle.windows',
+                 'qrainbowstyle.widgets')
+
+
+def _run(code, *options):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    return subprocess.run([sys.executable] + list(options) + ['-c', code], env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True)
+
+
+def _import_times(module=None):
+    """Return import times of interpreter startup and module in microseconds.
+
+    Returns:
+        tuple: cumulative time of all imports and self time of module and its submodules.
+    """
+    stderr = _run('import ' + module if module else 'pass', '-X', 'importtime').stderr
+    times = re.findall(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$', stderr, re.MULTILINE)
+    assert module is None or any(name == module for _, _, _, name in times), stderr
+    # top level entries only, nested imports are included in their cumulative time
+    total = sum(int(cumulative) for _, cumulative, indent, _ in times if not indent)
+    own = sum(int(self_time) for self_time, _, _, name in times
+              if module and (name == module or name.startswith(module + '.')))
+    return total, own
+
+
+def test_import_time():
+    startup = min(_import_times()[0] for _ in range(IMPORT_TIME_RUNS))
+    baseline = min(_import_times(BASELINE_IMPORT)[0] for _ in range(IMPORT_TIME_RUNS)) - startup
+    runs = [_import_times('qrainbowstyle') for _ in range(IMPORT_TIME_RUNS)]
+    assert min(total for total, _ in runs) - startup < baseline
+
+    # time spent in qrainbowstyle itself does not grow
+    assert min(own for _, own in runs) < OWN_IMPORT_TIME_BUDGET
+
+
+def test_import_is_lazy():
+    code = ('import sys, qrainbowstyle; '
+            'print(",".join(m for m in {!r} if m in sys.modules))'.format(HEAVY_MODULES))
+    assert _run(code).stdout.strip() == ''
+
+    # submodules and widgets are imported on first access
+    code = ('import sys, qrainbowstyle; '
+            'from qrainbowstyle.widgets import WaitingSpinner; '
+            'print(qrainbowstyle.palette.Oceanic.__name__, WaitingSpinner.__name__, '
+            '"qrainbowstyle.widgets.QRoundProgressBar.qroundprogressbar" in sys.modules)')
+    assert _run(code).stdout.split() == ['Oceanic', 'WaitingSpinner', 'False']
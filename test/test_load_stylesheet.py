@@ -0,0 +1,256 @@
+#!python
+# -*- coding: utf-8 -*-
+"""Test loading of the pre-compiled stylesheets."""
+
+# Standard library imports
+import os
+import re
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Third party imports
+import pytest
+from qtpy.QtCore import QFile
+from qtpy.QtWidgets import QApplication
+
+# Local imports
+import qrainbowstyle
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_stylesheet_cache():
+    qrainbowstyle.clearStylesheetCache()
+
+    first = qrainbowstyle.load_stylesheet(style='oceanic')
+    second = qrainbowstyle.load_stylesheet(style='Oceanic')
+    assert first == second
+
+    info = qrainbowstyle.getStylesheetCacheInfo()
+    assert info['hits'] == 1
+    assert info['misses'] == 1
+    assert info['size'] == 1
+
+
+def test_stylesheet_cache_invalidation():
+    qrainbowstyle.clearStylesheetCache()
+    qrainbowstyle.load_stylesheet(style='oceanic')
+    qrainbowstyle.load_stylesheet(style='darkorange')
+
+    qrainbowstyle.clearStylesheetCache('OCEANIC')
+    assert qrainbowstyle.getStylesheetCacheInfo()['size'] == 1
+
+    qrainbowstyle.load_stylesheet(style='oceanic')
+    assert qrainbowstyle.getStylesheetCacheInfo()['misses'] == 3
+
+
+def test_switch_style():
+    oceanic = qrainbowstyle.load_stylesheet(style='oceanic')
+    assert qrainbowstyle.getCurrentPalette().__name__ == 'Oceanic'
+
+    darkorange = qrainbowstyle.load_stylesheet(style='darkorange')
+    assert qrainbowstyle.getCurrentPalette().__name__ == 'DarkOrange'
+    assert oceanic != darkorange
+
+
+def test_load_does_not_change_global_state():
+    from qrainbowstyle.utils.resources import get_registered_style
+
+    cwd = os.getcwd()
+    path = list(sys.path)
+
+    qrainbowstyle.load_stylesheet(style='pwrdark')
+    qrainbowstyle.load_stylesheet(style='oceanic')
+
+    assert os.getcwd() == cwd
+    assert sys.path == path
+    assert get_registered_style() == 'Oceanic'
+    assert QFile(':/qss_icons/rc/arrow_down.png').exists()
+
+
+def test_create_rcc_file(tmp_path):
+    from qtpy.QtCore import QResource
+    from qrainbowstyle.utils.resources import create_rcc_file
+
+    rcc_filepath = str(tmp_path / qrainbowstyle.RCC_FILE)
+    module_filepath = os.path.join(qrainbowstyle.STYLES_PATH, 'Oceanic', 'style_rc.py')
+    create_rcc_file(module_filepath, rcc_filepath)
+
+    assert QResource.registerResource(rcc_filepath, '/test_rcc')
+    assert QFile(':/test_rcc/qss_icons/rc/arrow_down.png').exists()
+    assert QFile(':/test_rcc/qrainbowstyle/style.qss').exists()
+    assert QResource.unregisterResource(rcc_filepath, '/test_rcc')
+
+
+def test_create_shared_images(tmp_path):
+    from qrainbowstyle.utils.images import create_shared_images
+
+    shared_rc_path = str(tmp_path / 'rc_shared')
+    manifests = []
+    for style in ('QDarkStyle3', 'QDarkStyle3Light'):
+        rc_path = os.path.join(qrainbowstyle.STYLES_PATH, style, 'rc')
+        manifest_path = str(tmp_path / (style + '.json'))
+        manifests.append(create_shared_images(rc_path, manifest_path, shared_rc_path=shared_rc_path))
+
+    stored = os.listdir(shared_rc_path)
+    base_images = [name for manifest in manifests for name in manifest]
+    assert len(set(os.path.splitext(name)[0] for name in stored if '@' not in name)) < len(base_images)
+    for manifest in manifests:
+        for shared_name in manifest.values():
+            assert shared_name in stored
+            assert shared_name.replace('.png', '@2x.png') in stored
+
+
+def test_load_runtime_palette():
+    from qrainbowstyle.palette import Oceanic
+
+    palette = dict(Oceanic.to_dict(), COLOR_ACCENT_3='#b03a2e')
+    stylesheet = qrainbowstyle.load_stylesheet(palette=palette)
+    assert '#b03a2e' in stylesheet
+    assert qrainbowstyle.getCurrentPalette().COLOR_ACCENT_3 == '#b03a2e'
+
+    # icons are registered in memory
+    url = re.search(r'url\("([^"]+arrow_down\.png)"\)', stylesheet).group(1)
+    assert url.startswith(':/qrainbowstyle_runtime/')
+    assert QFile(url).exists()
+
+    # result is memoized per palette hash
+    info = qrainbowstyle.getStylesheetCacheInfo()
+    assert qrainbowstyle.load_stylesheet(palette=dict(palette)) == stylesheet
+    assert qrainbowstyle.getStylesheetCacheInfo()['hits'] == info['hits'] + 1
+
+    assert qrainbowstyle.load_stylesheet(palette=Oceanic) != stylesheet
+
+
+def test_runtime_palette_urls():
+    from qrainbowstyle.palette import Oceanic
+
+    stylesheet = qrainbowstyle.load_stylesheet(palette=dict(Oceanic.to_dict(), COLOR_ACCENT_3='#2e86c1'))
+    urls = set(re.findall(r'url\("?([^")]+)"?\)', stylesheet))
+    assert any('button_nt_close' in url for url in urls)
+
+    # every icon, titlebar buttons included, comes from resources of runtime palette
+    assert all(url.startswith(':/qrainbowstyle_runtime/') for url in urls)
+    assert [url for url in urls if not QFile.exists(url)] == []
+
+
+def test_prepare_without_qss_file(monkeypatch):
+    from qrainbowstyle.utils.loader import get_executor
+
+    qrainbowstyle.clearStylesheetCache()
+    expected = qrainbowstyle.load_stylesheet(style='oceanic')
+    qrainbowstyle.clearStylesheetCache()
+
+    # installed package ships only binary resources of styles
+    isfile = os.path.isfile
+    monkeypatch.setattr(os.path, 'isfile', lambda path: not path.endswith(qrainbowstyle.QSS_FILE) and isfile(path))
+    get_executor().submit(qrainbowstyle._prepare_stylesheet, 'oceanic').result(timeout=30)
+
+    info = qrainbowstyle.getStylesheetCacheInfo()
+    assert qrainbowstyle.load_stylesheet(style='oceanic') == expected
+    assert qrainbowstyle.getStylesheetCacheInfo()['hits'] == info['hits'] + 1
+
+
+def test_rainbowize():
+    from qrainbowstyle.palette import Oceanic
+
+    qrainbowstyle.load_stylesheet(style='oceanic')
+    assert qrainbowstyle.rainbowize('color: COLOR_ACCENT_3;') == 'color: {};'.format(Oceanic.COLOR_ACCENT_3)
+
+    # references in values are resolved, longest names win
+    assert qrainbowstyle.rainbowize(['border: BORDER_SELECTION_1;', 'border: BORDER_1;']) == [
+        'border: 1px solid {};'.format(Oceanic.COLOR_ACCENT_1),
+        'border: 1px solid {};'.format(Oceanic.COLOR_BACKGROUND_1),
+    ]
+    assert qrainbowstyle.rainbowize('COLOR_TEXT_1', palette={'COLOR_TEXT_1': '#000000'}) == '#000000'
+
+    # texts containing batch separator keep result aligned with input
+    assert qrainbowstyle.rainbowize(['a\0COLOR_TEXT_1', 'COLOR_TEXT_1'], palette={'COLOR_TEXT_1': '#000000'}) == [
+        'a\0#000000', '#000000']
+
+
+def test_load_snapshot(tmp_path, monkeypatch):
+    from qrainbowstyle.registry import find_palette
+    from qrainbowstyle.utils.snapshot import SNAPSHOT_DIR_ENV
+
+    monkeypatch.setenv(SNAPSHOT_DIR_ENV, str(tmp_path))
+    qrainbowstyle.clearStylesheetCache()
+    stylesheet = qrainbowstyle.load_stylesheet(style='oceanic', snapshot=True)
+    snapshots = os.listdir(str(tmp_path))
+    assert len(snapshots) == 1
+
+    # second load reads snapshot instead of resources
+    qrainbowstyle.clearStylesheetCache()
+    assert qrainbowstyle.load_stylesheet(style='oceanic', snapshot=True) == stylesheet
+    # registered palette is reused, not recreated from snapshot
+    palette = qrainbowstyle.getCurrentPalette()
+    assert palette is find_palette('oceanic')
+    assert palette is qrainbowstyle.palette.Oceanic
+
+    # corrupted snapshot is ignored and written again
+    snapshot_filepath = os.path.join(str(tmp_path), snapshots[0])
+    with open(snapshot_filepath, 'w') as fh:
+        fh.write('{"snapshot":')
+    qrainbowstyle.clearStylesheetCache()
+    assert qrainbowstyle.load_stylesheet(style='oceanic', snapshot=True) == stylesheet
+    assert qrainbowstyle.getCurrentPalette() is qrainbowstyle.palette.Oceanic
+
+    qrainbowstyle.clearStylesheetSnapshots()
+    assert os.listdir(str(tmp_path)) == []
+
+
+def _wait(future, timeout=10.0):
+    """Process events until future is resolved."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while not future.done() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    return future.result(timeout=0)
+
+
+def test_load_stylesheet_async():
+    qrainbowstyle.clearStylesheetCache()
+    expected = qrainbowstyle.load_stylesheet(style='darkorange')
+
+    qrainbowstyle.clearStylesheetCache()
+    for future in qrainbowstyle.prefetchStylesheets(['darkorange', 'oceanic']):
+        future.result(timeout=10)
+    assert qrainbowstyle.getStylesheetCacheInfo()['size'] == 2
+
+    # prepared stylesheet is the same as loaded from resources
+    future = qrainbowstyle.load_stylesheet_async(style='darkorange')
+    assert _wait(future) == expected
+    assert app.styleSheet() == expected
+    assert qrainbowstyle.getCurrentPalette() is qrainbowstyle.palette.DarkOrange
+    assert qrainbowstyle.getStylesheetCacheInfo()['misses'] == 0
+
+    palette = {**qrainbowstyle.palette.Oceanic.to_dict(), 'COLOR_ACCENT_3': '#b03a2e'}
+    stylesheet = _wait(qrainbowstyle.load_stylesheet_async(palette=palette, apply=False))
+    assert stylesheet == qrainbowstyle.load_stylesheet(palette=palette)
+    assert app.styleSheet() == expected
+
+    future = qrainbowstyle.load_stylesheet_async(style='missing')
+    with pytest.raises(FileNotFoundError):
+        _wait(future)
+
+
+def test_switch_without_repolish():
+    from qrainbowstyle.utils.switcher import StyleSwitcher
+
+    switcher = StyleSwitcher(app)
+    switcher.switch(style='oceanic')
+
+    # the same style again does not re-polish widgets
+    info = switcher.switch(style='Oceanic')
+    assert info['skipped']
+    assert switcher.lastSwitchInfo() is info
+
+    # styles share rules, only values differ
+    info = switcher.switch(style='darkorange')
+    assert not info['skipped']
+    assert not info['structural']
+    assert 0 < info['changed'] < info['rules']
+    assert app.styleSheet() == qrainbowstyle.load_stylesheet(style='darkorange')
@@ -0,0 +1,111 @@
+#!python
+# -*- coding: utf-8 -*-
+"""Test frozen palettes."""
+
+# Standard library imports
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Third party imports
+import pytest
+from qtpy.QtGui import QPalette
+from qtpy.QtWidgets import QApplication
+
+# Local imports
+from qrainbowstyle.palette import Oceanic
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_frozen_palette():
+    frozen = Oceanic.frozen()
+    assert frozen is Oceanic.frozen()
+    assert frozen.COLOR_ACCENT_4 == Oceanic.COLOR_ACCENT_4
+    assert frozen.rgba('COLOR_BACKGROUND_1') == 0x263238ff
+
+    # Qt objects are created once and shared
+    assert frozen.color('COLOR_ACCENT_4') is frozen.color('COLOR_ACCENT_4')
+    assert frozen.color('COLOR_ACCENT_4').name().lower() == Oceanic.COLOR_ACCENT_4.lower()
+    assert frozen.brush('COLOR_ACCENT_4').color() == frozen.color('COLOR_ACCENT_4')
+    assert frozen.qpalette().color(QPalette.Link) == frozen.color('COLOR_ACCENT_3')
+
+    assert frozen.qpalette() is frozen.qpalette()
+
+    with pytest.raises(AttributeError):
+        frozen.COLOR_ACCENT_4 = '#000000'
+    with pytest.raises(KeyError):
+        frozen.color('SIZE_BORDER_RADIUS')
+
+
+def test_frozen_palette_released():
+    import gc
+    import weakref
+    from qrainbowstyle.palette import _frozen_palettes
+
+    palette = type('RuntimePalette', (Oceanic,), {'COLOR_ACCENT_3': '#b03a2e'})
+    frozen = palette.frozen()
+    assert frozen.palette is palette
+    assert frozen.qpalette().color(QPalette.Link).name() == '#b03a2e'
+
+    # frozen palette does not keep palette class alive, it is released with it
+    reference = weakref.ref(palette)
+    count = len(_frozen_palettes)
+    del palette, frozen
+    gc.collect()
+    assert reference() is None
+    assert len(_frozen_palettes) == count - 1
+
+
+def test_palette_registry():
+    import qrainbowstyle
+    from qrainbowstyle.palette import BasePalette
+    from qrainbowstyle.registry import find_palette, find_style, register_palette, unregister_palette
+
+    assert find_palette('OCEANIC') is Oceanic
+    assert find_style('oceanic') == 'Oceanic'
+    assert Oceanic in qrainbowstyle.getAvailablePalettes()
+
+    class TestRegistryPalette(Oceanic, register=True):
+        COLOR_ACCENT_3 = '#b03a2e'
+
+    # subclasses are registered only on request
+    class NotRegistered(BasePalette):
+        pass
+
+    try:
+        assert find_palette('testregistrypalette') is TestRegistryPalette
+        assert find_palette(NotRegistered.__name__) is None
+        assert 'TestRegistryPalette' in qrainbowstyle.getAvailableStyles()
+
+        # bundled palette is not replaced
+        with pytest.raises(ValueError):
+            register_palette(type('Oceanic', (BasePalette,), {}))
+        assert find_palette('oceanic') is Oceanic
+
+        # palette without generated style is rendered at runtime
+        assert '#b03a2e' in qrainbowstyle.load_stylesheet(style='testregistrypalette')
+        assert qrainbowstyle.getCurrentPalette() is TestRegistryPalette
+    finally:
+        unregister_palette('TestRegistryPalette')
+
+
+def test_reload_palettes():
+    import importlib
+    import qrainbowstyle.palette
+    from qrainbowstyle.registry import find_palette, get_palettes, register_palette
+
+    module = qrainbowstyle.palette
+    bundled = get_palettes()
+    namespace = dict(vars(module))
+    try:
+        # watch mode of process_qrc reloads edited palettes, new classes replace old ones
+        importlib.reload(module)
+        assert module.Oceanic is not Oceanic
+        assert find_palette('oceanic') is module.Oceanic
+        assert len(get_palettes()) == len(bundled)
+    finally:
+        vars(module).update(namespace)
+        for palette in bundled:
+            register_palette(palette)
+    assert find_palette('oceanic') is Oceanic
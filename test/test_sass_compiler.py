@@ -6,7 +6,10 @@
 import tempfile
 
 # Local imports
-from qrainbowstyle.utils.scss import create_custom_qss, create_qss
+from qrainbowstyle.palette import Oceanic, PWRLight
+from qrainbowstyle.utils.scss import (clear_qss_cache, compile_qss_string, create_custom_qss, create_qss,
+                                     create_qss_template)
+from qrainbowstyle.utils.template import QssTemplate, render_qss
 
 
 def test_create_qss():
@@ -31,3 +34,28 @@ def test_create_custom_qss():
         '0px',
     )
     assert qss
+
+
+def test_compile_qss_string(tmpdir):
+    qss = compile_qss_string(Oceanic, cache_dir=str(tmpdir))
+    assert Oceanic.COLOR_ACCENT_3 in qss
+    assert len(tmpdir.listdir()) == 1
+
+    # compiled from memory cache and from cache directory
+    assert compile_qss_string(Oceanic) == qss
+    clear_qss_cache()
+    assert compile_qss_string(Oceanic, cache_dir=str(tmpdir)) == qss
+    assert compile_qss_string(PWRLight) != qss
+
+
+def test_qss_template(tmpdir):
+    template_filepath = str(tmpdir.join('template.json'))
+    template = create_qss_template(template_filepath)
+    assert render_qss(Oceanic, template) == compile_qss_string(Oceanic)
+
+    # palette can be a dictionary, loaded template renders the same stylesheet
+    palette = PWRLight.to_dict()
+    palette['COLOR_ACCENT_3'] = '#123456'
+    qss = render_qss(palette, QssTemplate.load(template_filepath))
+    assert '#123456' in qss
+    assert qss == template.render(palette)